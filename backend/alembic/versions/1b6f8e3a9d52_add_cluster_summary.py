@@ -0,0 +1,62 @@
+"""Add cluster summary
+
+Revision ID: 1b6f8e3a9d52
+Revises: e7a1f94b3c28
+Create Date: 2026-10-18 15:14:08.336570
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b6f8e3a9d52'
+down_revision: Union[str, Sequence[str], None] = 'e7a1f94b3c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cluster_summary',
+    sa.Column('cluster_id', sa.String(), nullable=False),
+    sa.Column('representative_fact_id', sa.Integer(), nullable=True),
+    sa.Column('representative_fact', sa.Text(), nullable=False),
+    sa.Column('fact_count', sa.Integer(), nullable=False),
+    sa.Column('article_count', sa.Integer(), nullable=False),
+    sa.Column('first_seen', sa.DateTime(), nullable=True),
+    sa.Column('last_seen', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['representative_fact_id'], ['fact.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('cluster_id')
+    )
+    op.create_index('ix_cluster_summary_last_seen', 'cluster_summary', [sa.text('last_seen DESC'), 'cluster_id'], unique=False)
+
+    # Backfill from the alignments written so far.
+    op.execute("""
+        INSERT INTO cluster_summary (
+            cluster_id, representative_fact_id, representative_fact,
+            fact_count, article_count, first_seen, last_seen
+        )
+        SELECT
+            al.cluster_id,
+            (array_agg(f.id ORDER BY f.confidence DESC NULLS LAST, f.id))[1],
+            (array_agg(f.text ORDER BY f.confidence DESC NULLS LAST, f.id))[1],
+            count(*),
+            count(DISTINCT f.article_id),
+            min(a.published_at),
+            max(a.published_at)
+        FROM alignment al
+        JOIN fact f ON f.id = al.fact_id
+        JOIN article a ON a.id = f.article_id
+        WHERE al.cluster_id <> '-1'
+        GROUP BY al.cluster_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cluster_summary_last_seen', table_name='cluster_summary')
+    op.drop_table('cluster_summary')
@@ -0,0 +1,34 @@
+"""Add source article count
+
+Revision ID: 5e8b3d0c4f71
+Revises: c51f0b7e2a96
+Create Date: 2026-10-18 13:05:49.117620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b3d0c4f71'
+down_revision: Union[str, Sequence[str], None] = 'c51f0b7e2a96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('source', sa.Column('article_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE source s
+        SET article_count = counts.n
+        FROM (SELECT source_id, count(*) AS n FROM article GROUP BY source_id) counts
+        WHERE counts.source_id = s.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('source', 'article_count')
@@ -0,0 +1,36 @@
+"""Add article keyset indexes
+
+Revision ID: 9d27c4a8e5b0
+Revises: 5e8b3d0c4f71
+Create Date: 2026-10-18 13:48:22.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d27c4a8e5b0'
+down_revision: Union[str, Sequence[str], None] = '5e8b3d0c4f71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Extend the published_at indexes with id so keyset pagination on
+    # (published_at, id) is served by an index scan without a sort.
+    op.drop_index('ix_article_source_id_published_at', table_name='article')
+    op.drop_index('ix_article_published_at', table_name='article')
+    op.create_index('ix_article_published_at_id', 'article', [sa.text('published_at DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_article_source_id_published_at_id', 'article', ['source_id', sa.text('published_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_article_source_id_published_at_id', table_name='article')
+    op.drop_index('ix_article_published_at_id', table_name='article')
+    op.create_index('ix_article_published_at', 'article', [sa.text('published_at DESC')], unique=False)
+    op.create_index('ix_article_source_id_published_at', 'article', ['source_id', sa.text('published_at DESC')], unique=False)
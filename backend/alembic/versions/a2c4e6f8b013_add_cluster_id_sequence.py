@@ -0,0 +1,36 @@
+"""Add cluster id sequence
+
+Revision ID: a2c4e6f8b013
+Revises: f3a7c2d91e60
+Create Date: 2026-10-18 18:40:12.904651
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c4e6f8b013'
+down_revision: Union[str, Sequence[str], None] = 'f3a7c2d91e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('cluster_id_seq')))
+    # Continue after every id already handed out, including ids from runs
+    # that predate cluster_centroid and so only appear in alignment.
+    op.execute("""
+        SELECT setval('cluster_id_seq', greatest(
+            (SELECT coalesce(max(cluster_id::integer), 0) FROM alignment),
+            (SELECT coalesce(max(cluster_id::integer), 0) FROM cluster_centroid)
+        ) + 1, false)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence('cluster_id_seq')))
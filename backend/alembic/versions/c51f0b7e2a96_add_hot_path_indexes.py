@@ -0,0 +1,52 @@
+"""Add hot path indexes
+
+Revision ID: c51f0b7e2a96
+Revises: 8a4d2e6b9f13
+Create Date: 2026-10-18 12:26:03.871145
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c51f0b7e2a96'
+down_revision: Union[str, Sequence[str], None] = '8a4d2e6b9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Earlier clustering runs could align a fact more than once; keep the
+    # latest alignment so the unique constraint can be created.
+    op.execute("""
+        DELETE FROM alignment a
+        USING alignment b
+        WHERE a.fact_id = b.fact_id AND a.id < b.id
+    """)
+
+    op.create_index('ix_article_published_at', 'article', [sa.text('published_at DESC')], unique=False)
+    op.create_index('ix_article_source_id_published_at', 'article', ['source_id', sa.text('published_at DESC')], unique=False)
+    op.create_index(op.f('ix_fact_article_id'), 'fact', ['article_id'], unique=False)
+    op.create_unique_constraint('alignment_fact_id_key', 'alignment', ['fact_id'])
+    op.create_index(op.f('ix_alignment_cluster_id'), 'alignment', ['cluster_id'], unique=False)
+    op.create_index(
+        'ix_alignment_noise_fact_id',
+        'alignment',
+        ['fact_id'],
+        unique=False,
+        postgresql_where=sa.text("cluster_id = '-1'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_alignment_noise_fact_id', table_name='alignment')
+    op.drop_index(op.f('ix_alignment_cluster_id'), table_name='alignment')
+    op.drop_constraint('alignment_fact_id_key', 'alignment', type_='unique')
+    op.drop_index(op.f('ix_fact_article_id'), table_name='fact')
+    op.drop_index('ix_article_source_id_published_at', table_name='article')
+    op.drop_index('ix_article_published_at', table_name='article')
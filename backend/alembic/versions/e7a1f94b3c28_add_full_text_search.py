@@ -0,0 +1,62 @@
+"""Add full text search
+
+Revision ID: e7a1f94b3c28
+Revises: 9d27c4a8e5b0
+Create Date: 2026-10-18 14:31:55.092736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a1f94b3c28'
+down_revision: Union[str, Sequence[str], None] = '9d27c4a8e5b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Generated columns are maintained by Postgres on every insert/update,
+    # so rows written by the synthesis service are searchable immediately.
+    op.add_column('article', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.add_column('fact', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', text)", persisted=True),
+        nullable=True,
+    ))
+
+    op.create_index('ix_article_search_vector', 'article', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_fact_search_vector', 'fact', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_article_title_trgm',
+        'article',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_article_title_trgm', table_name='article')
+    op.drop_index('ix_fact_search_vector', table_name='fact')
+    op.drop_index('ix_article_search_vector', table_name='article')
+    op.drop_column('fact', 'search_vector')
+    op.drop_column('article', 'search_vector')
@@ -0,0 +1,35 @@
+"""Drop alignment noise index
+
+Revision ID: f3a7c2d91e60
+Revises: 1b6f8e3a9d52
+Create Date: 2026-10-18 18:02:41.517304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a7c2d91e60'
+down_revision: Union[str, Sequence[str], None] = '1b6f8e3a9d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nothing reads noise alignments on their own; rebuilds reload every fact.
+    op.drop_index('ix_alignment_noise_fact_id', table_name='alignment')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_alignment_noise_fact_id',
+        'alignment',
+        ['fact_id'],
+        unique=False,
+        postgresql_where=sa.text("cluster_id = '-1'"),
+    )
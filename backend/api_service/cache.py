@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Pattern, Tuple
+
+import redis.asyncio as aioredis
+from starlette.requests import Request
+from starlette.responses import Response
+
+from backend.common.events import DATA_CHANGED_CHANNEL, DATA_VERSION_KEY
+from backend.common.queue import REDIS_HOST, REDIS_PORT
+
+logger = logging.getLogger(__name__)
+
+CACHE_SETTINGS = {
+    "enabled": os.getenv("API_CACHE_ENABLED", "true").lower() == "true",
+    "local_max_entries": int(os.getenv("API_CACHE_LOCAL_MAX_ENTRIES", 1024)),
+    # How long a known data version is trusted before asking Redis again;
+    # change events normally update it sooner.
+    "version_ttl": float(os.getenv("API_CACHE_VERSION_TTL", 1.0)),
+}
+
+# Cached GET paths and their TTLs in seconds. Entries are keyed on the data
+# version, so writes invalidate them immediately; the TTL only bounds
+# staleness if a change event is lost.
+CACHE_POLICIES: List[Tuple[Pattern, int]] = [
+    (re.compile(r"^/api/stats$"), int(os.getenv("API_CACHE_TTL_STATS", 30))),
+    (re.compile(r"^/api/sources(/\d+)?$"), int(os.getenv("API_CACHE_TTL_SOURCES", 300))),
+    (re.compile(r"^/api/articles(/\d+(/facts)?)?$"), int(os.getenv("API_CACHE_TTL_ARTICLES", 120))),
+    (re.compile(r"^/api/clusters(/\d+(/articles)?)?$"), int(os.getenv("API_CACHE_TTL_CLUSTERS", 120))),
+]
+
+KEY_PREFIX = "api:cache"
+
+
+def policy_ttl(path: str) -> Optional[int]:
+    for pattern, ttl in CACHE_POLICIES:
+        if pattern.match(path):
+            return ttl
+    return None
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    media_type: str
+    etag: str
+    expires_at: float # Wall-clock time, shared with the Redis tier
+
+    def dumps(self) -> bytes:
+        header = f"{self.expires_at}\n{self.etag}\n{self.media_type}\n".encode()
+        return header + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        expires_at, etag, media_type, body = data.split(b"\n", 3)
+        return cls(body, media_type.decode(), etag.decode(), float(expires_at))
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    # Weak comparison, as for any If-None-Match.
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+class DataVersion:
+    """
+    Tracks the data version published by the writers. A pub/sub listener
+    applies bumps as they happen; reads fall back to GET once the known
+    version is older than `version_ttl`, so a dropped subscription costs
+    at most that much staleness.
+    """
+
+    def __init__(self, client: aioredis.Redis, ttl: float):
+        self.client = client
+        self.ttl = ttl
+        self.version: Optional[int] = None
+        self.checked_at = float("-inf")
+        self._listener: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+
+    async def current(self) -> Optional[int]:
+        """
+        The current version, or None if Redis cannot be reached and
+        freshness cannot be verified.
+        """
+        if time.monotonic() - self.checked_at > self.ttl:
+            try:
+                self._set(int(await self.client.get(DATA_VERSION_KEY) or 0))
+            except aioredis.RedisError as e:
+                logger.warning("Could not read data version: %s", e)
+                return None
+        return self.version
+
+    def _set(self, version: int) -> None:
+        # Never move backwards if a GET races with a newer event.
+        if self.version is None or version > self.version:
+            self.version = version
+        self.checked_at = time.monotonic()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(DATA_CHANGED_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._set(int(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Data change listener failed, retrying: %s", e)
+                await asyncio.sleep(1)
+
+
+class ResponseCache:
+    """
+    Two-tier cache for GET responses: a per-process LRU in front of a Redis
+    tier shared by all API replicas. Responses carry an ETag, and matching
+    `If-None-Match` requests get a bodyless 304.
+    """
+
+    def __init__(self, client: aioredis.Redis, max_entries: int, version_ttl: float):
+        self.client = client
+        self.max_entries = max_entries
+        self.versions = DataVersion(client, version_ttl)
+        self._local: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._local_version: Optional[int] = None
+
+    async def __call__(self, request: Request, call_next):
+        ttl = policy_ttl(request.url.path) if request.method == "GET" else None
+        if ttl is None:
+            return await call_next(request)
+        version = await self.versions.current()
+        if version is None:
+            return await call_next(request)
+
+        if version != self._local_version:
+            self._local.clear()
+            self._local_version = version
+
+        query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        key = f"{KEY_PREFIX}:{version}:{request.url.path}?{query}"
+        entry = self._get_local(key) or await self._get_shared(key)
+        status = "HIT"
+        if entry is None:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            entry = CachedResponse(
+                body=body,
+                media_type=response.media_type or response.headers.get("content-type", "application/json"),
+                # Weak, since compression further out changes the bytes on the wire.
+                etag='W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+                expires_at=time.time() + ttl,
+            )
+            await self._set_shared(key, entry, ttl)
+            status = "MISS"
+        self._set_local(key, entry)
+
+        # Clients may keep the body but must revalidate, since any write
+        # can change it before the TTL runs out.
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": status}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+    def _get_local(self, key: str) -> Optional[CachedResponse]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return entry
+
+    def _set_local(self, key: str, entry: CachedResponse) -> None:
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def _get_shared(self, key: str) -> Optional[CachedResponse]:
+        try:
+            data = await self.client.get(key)
+        except aioredis.RedisError as e:
+            logger.warning("Response cache read failed: %s", e)
+            return None
+        return CachedResponse.loads(data) if data else None
+
+    async def _set_shared(self, key: str, entry: CachedResponse, ttl: int) -> None:
+        try:
+            await self.client.set(key, entry.dumps(), ex=ttl)
+        except aioredis.RedisError as e:
+            logger.warning("Response cache write failed: %s", e)
+
+
+def create_response_cache() -> ResponseCache:
+    client = aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT)
+    return ResponseCache(client, CACHE_SETTINGS["local_max_entries"], CACHE_SETTINGS["version_ttl"])
@@ -1,14 +1,55 @@
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+import os
+from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from typing import List, Literal, Optional
 from datetime import date
+from sqlalchemy import func, select, tuple_
 
 from . import models
-from .dependencies import get_db
-from backend.common.db.models import Article as DBArticle, Fact as DBFact, Source as DBSource, Alignment as DBAlignment
+from .cache import CACHE_SETTINGS, create_response_cache
+from .dependencies import db_session, engine, get_db, get_fact_index
+from .pagination import decode_cursor, encode_cursor, estimate_count
+from .projection import (
+    ARTICLE_FIELDS,
+    ARTICLE_SUMMARY_FIELDS,
+    FACT_COLUMNS,
+    article_columns,
+    fact_dict,
+    parse_fields,
+    pick,
+    source_dict,
+)
+from .search import search_articles
+from backend.common.db.models import Article as DBArticle, Fact as DBFact, Source as DBSource, Alignment as DBAlignment, ClusterSummary as DBClusterSummary
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # pragma: no cover - gzip only
+    BrotliMiddleware = None
+
+# Responses smaller than this are sent uncompressed.
+COMPRESSION_MIN_SIZE = int(os.getenv("API_COMPRESSION_MIN_SIZE", 1024))
+
+app = FastAPI(title="Perspective API", default_response_class=ORJSONResponse)
+
+# Registered before CORS so cached responses still pass through it.
+response_cache = create_response_cache() if CACHE_SETTINGS["enabled"] else None
+if response_cache is not None:
+    app.middleware("http")(response_cache)
 
-app = FastAPI(title="Perspective API")
+    @app.on_event("startup")
+    async def start_response_cache():
+        response_cache.versions.start()
+
+    @app.on_event("shutdown")
+    async def stop_response_cache():
+        await response_cache.versions.stop()
 
 # Configure CORS
 origins = [
@@ -24,138 +65,266 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so cached responses are compressed too.
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+
+@app.on_event("shutdown")
+async def dispose_engine():
+    await engine.dispose()
+
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Welcome to the Perspective API"}
 
 
 @app.get("/api/articles", response_model=models.PaginatedArticles)
-def list_articles(
-    db: Session = Depends(get_db),
+async def list_articles(
+    db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 20,
     source_id: Optional[int] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     q: Optional[str] = None, # Added query parameter
+    cursor: Optional[str] = None,
+    paginate: Literal["offset", "cursor"] = "offset",
+    count: Optional[Literal["exact", "estimated", "none"]] = None,
+    fields: Optional[str] = None,
 ):
-    query = db.query(DBArticle)
+    """
+    List articles, newest first.
+
+    Offset mode (default) pages with skip/limit. Cursor mode (paginate=cursor,
+    or any request with a cursor) pages on (published_at, id) and returns an
+    opaque next_cursor, so every page costs the same however deep it is.
+    `count` picks how `total` is computed; it defaults to exact in offset
+    mode and estimated in cursor mode. `fields` limits items to a subset
+    of their fields.
+    """
+    cursor_mode = paginate == "cursor" or cursor is not None
+    count = count or ("estimated" if cursor_mode else "exact")
+    names = parse_fields(fields, ARTICLE_SUMMARY_FIELDS)
+
+    # The cursor is built from (published_at, id), so both are always selected.
+    query = select(*article_columns(set(names) | {"id", "published_at"}))
+    filtered = any(v is not None for v in (source_id, start_date, end_date, q))
     if source_id:
-        query = query.filter(DBArticle.source_id == source_id)
+        query = query.where(DBArticle.source_id == source_id)
     if start_date:
-        query = query.filter(DBArticle.published_at >= start_date)
+        query = query.where(DBArticle.published_at >= start_date)
     if end_date:
-        query = query.filter(DBArticle.published_at <= end_date)
+        query = query.where(DBArticle.published_at <= end_date)
     if q:
-        query = query.filter(DBArticle.title.ilike(f"%{q}%")) # Case-insensitive search
-    
-    total = query.count()
-    articles = query.offset(skip).limit(limit).all()
-    return {"items": articles, "total": total, "skip": skip, "limit": limit}
+        # Full-text match on title and body, served by the GIN index
+        query = query.where(DBArticle.search_vector.op("@@")(func.websearch_to_tsquery("english", q)))
+
+    total = None
+    if count == "exact":
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    elif count == "estimated":
+        total = await estimate_count(db, query, filtered)
+
+    ordered = query.order_by(DBArticle.published_at.desc(), DBArticle.id.desc())
+    next_cursor = None
+    if cursor_mode:
+        if cursor:
+            published_at, article_id = decode_cursor(cursor)
+            ordered = ordered.where(
+                tuple_(DBArticle.published_at, DBArticle.id) < tuple_(published_at, article_id)
+            )
+        # One extra row tells us whether there is a next page.
+        rows = (await db.execute(ordered.limit(limit + 1))).mappings().all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["published_at"], rows[-1]["id"])
+        skip = 0
+    else:
+        rows = (await db.execute(ordered.offset(skip).limit(limit))).mappings().all()
+
+    # Rows are already in response shape; skip response_model validation.
+    return ORJSONResponse({
+        "items": [pick(row, names) for row in rows],
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "total_is_estimate": count == "estimated",
+        "next_cursor": next_cursor,
+    })
 
 
 @app.get("/api/articles/{article_id}", response_model=models.Article)
-def get_article(article_id: int, db: Session = Depends(get_db)):
-    from sqlalchemy.orm import joinedload
-    article = db.query(DBArticle).options(joinedload(DBArticle.source)).filter(DBArticle.id == article_id).first()
+async def get_article(article_id: int, db: AsyncSession = Depends(get_db), fields: Optional[str] = None):
+    names = parse_fields(fields, ARTICLE_FIELDS)
+    # Relationships are loaded up front; async sessions cannot lazy-load.
+    options = [load_only(*article_columns(set(names) | {"id"}))]
+    if "facts" in names:
+        options.append(selectinload(DBArticle.facts).load_only(*FACT_COLUMNS))
+    if "source" in names:
+        options.append(joinedload(DBArticle.source))
+    article = await db.scalar(select(DBArticle).options(*options).where(DBArticle.id == article_id))
     if article is None:
         raise HTTPException(status_code=404, detail="Article not found")
-    
-    # Manually construct the Article model to include the source
-    return models.Article(
-        id=article.id,
-        title=article.title,
-        url=article.url,
-        published_at=article.published_at,
-        source_id=article.source_id,
-        summary=article.summary, # Assuming summary exists
-        tone=article.tone, # Assuming tone exists
-        tone_confidence=article.tone_confidence, # Assuming tone_confidence exists
-        flesch_kincaid_grade=article.flesch_kincaid_grade, # Assuming flesch_kincaid_grade exists
-        facts=article.facts,
-        source=models.Source(
-            id=article.source.id,
-            name=article.source.name,
-            url=article.source.url,
-            article_count=db.query(DBArticle).filter(DBArticle.source_id == article.source.id).count()
-        ),
-        body=article.body, # Include body
-    )
+
+    content = {}
+    for name in names:
+        if name == "facts":
+            content[name] = [fact_dict(fact) for fact in article.facts]
+        elif name == "source":
+            content[name] = source_dict(article.source)
+        else:
+            content[name] = getattr(article, name)
+    return ORJSONResponse(content)
 
 
 @app.get("/api/articles/{article_id}/facts", response_model=List[models.Fact])
-def get_article_facts(article_id: int, db: Session = Depends(get_db)):
-    article = db.query(DBArticle).filter(DBArticle.id == article_id).first()
-    if article is None:
+async def get_article_facts(article_id: int, db: AsyncSession = Depends(get_db)):
+    facts = (
+        await db.execute(select(*FACT_COLUMNS).where(DBFact.article_id == article_id).order_by(DBFact.id))
+    ).all()
+    if not facts and await db.get(DBArticle, article_id) is None:
         raise HTTPException(status_code=404, detail="Article not found")
-    return article.facts
+    return ORJSONResponse([fact_dict(fact) for fact in facts])
+
+
+@app.get("/api/facts/{fact_id}/similar", response_model=List[models.SimilarFact])
+async def get_similar_facts(fact_id: int, k: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_db)):
+    # Loading or reloading the index reads it from disk; keep that off the event loop.
+    fact_index = await run_in_threadpool(get_fact_index)
+    if fact_index is None:
+        raise HTTPException(status_code=503, detail="Fact index not available")
+
+    neighbours = await run_in_threadpool(fact_index.similar_to, fact_id, k)
+    if not neighbours:
+        raise HTTPException(status_code=404, detail="Fact not indexed")
+
+    facts = {
+        fact.id: fact
+        for fact in await db.scalars(select(DBFact).where(DBFact.id.in_([i for i, _ in neighbours])))
+    }
+    return [
+        models.SimilarFact(
+            id=i,
+            article_id=facts[i].article_id,
+            text=facts[i].text,
+            similarity=similarity,
+        )
+        for i, similarity in neighbours
+        if i in facts
+    ]
+
+
+def _cluster_from_summary(summary: DBClusterSummary) -> models.Cluster:
+    return models.Cluster(
+        id=int(summary.cluster_id),
+        representative_fact=summary.representative_fact,
+        fact_count=summary.fact_count,
+        article_count=summary.article_count,
+        first_seen=summary.first_seen,
+        last_seen=summary.last_seen,
+    )
 
 
 @app.get("/api/clusters", response_model=List[models.Cluster])
-def list_clusters(db: Session = Depends(get_db), skip: int = 0, limit: int = 20):
-    # This is a simplified implementation.
-    # A real implementation would involve more complex aggregation.
-    return []
+async def list_clusters(db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 20):
+    summaries = await db.scalars(
+        select(DBClusterSummary)
+        .order_by(DBClusterSummary.last_seen.desc().nulls_last(), DBClusterSummary.cluster_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [_cluster_from_summary(summary) for summary in summaries]
 
 
 @app.get("/api/clusters/{cluster_id}", response_model=models.ClusterDetail)
-def get_cluster(cluster_id: int, db: Session = Depends(get_db)):
-    # This is a simplified implementation.
-    raise HTTPException(status_code=404, detail="Cluster not found")
+async def get_cluster(cluster_id: int, db: AsyncSession = Depends(get_db), fact_limit: int = 100):
+    summary = await db.get(DBClusterSummary, str(cluster_id))
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    aligned_facts = await db.scalars(
+        select(DBFact)
+        .join(DBAlignment, DBAlignment.fact_id == DBFact.id)
+        .where(DBAlignment.cluster_id == summary.cluster_id)
+        .order_by(DBFact.confidence.desc().nulls_last(), DBFact.id)
+        .limit(fact_limit)
+    )
+    cluster = _cluster_from_summary(summary)
+    return models.ClusterDetail(
+        **cluster.dict(),
+        aligned_facts=[models.Fact.from_orm(fact) for fact in aligned_facts],
+    )
 
 
 @app.get("/api/clusters/{cluster_id}/articles", response_model=List[models.ArticleSummary])
-def get_cluster_articles(cluster_id: int, db: Session = Depends(get_db)):
-    # This is a simplified implementation.
-    raise HTTPException(status_code=404, detail="Cluster not found")
+async def get_cluster_articles(cluster_id: int, db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 20):
+    if await db.get(DBClusterSummary, str(cluster_id)) is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    member_articles = (
+        select(DBFact.article_id)
+        .join(DBAlignment, DBAlignment.fact_id == DBFact.id)
+        .where(DBAlignment.cluster_id == str(cluster_id))
+    )
+    rows = await db.execute(
+        select(*article_columns(ARTICLE_SUMMARY_FIELDS))
+        .where(DBArticle.id.in_(member_articles))
+        .order_by(DBArticle.published_at.desc(), DBArticle.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return ORJSONResponse([dict(row) for row in rows.mappings()])
 
 
 @app.get("/api/sources", response_model=List[models.Source])
-def list_sources(db: Session = Depends(get_db)):
-    sources = db.query(DBSource).all()
-    response_sources = []
-    for source in sources:
-        article_count = db.query(DBArticle).filter(DBArticle.source_id == source.id).count()
-        response_sources.append(models.Source(
-            id=source.id,
-            name=source.name,
-            url=source.url,
-            article_count=article_count
-        ))
-    return response_sources
+async def list_sources(db: AsyncSession = Depends(get_db)):
+    # article_count is maintained by the synthesis write path
+    return (await db.scalars(select(DBSource).order_by(DBSource.name))).all()
 
 
 @app.get("/api/sources/{source_id}", response_model=models.Source)
-def get_source(source_id: int, db: Session = Depends(get_db)):
-    source = db.query(DBSource).filter(DBSource.id == source_id).first()
+async def get_source(source_id: int, db: AsyncSession = Depends(get_db)):
+    source = await db.get(DBSource, source_id)
     if source is None:
         raise HTTPException(status_code=404, detail="Source not found")
-    article_count = db.query(DBArticle).filter(DBArticle.source_id == source.id).count()
-    return models.Source(
-        id=source.id,
-        name=source.name,
-        url=source.url,
-        article_count=article_count
-    )
+    return source
+
+
+async def _count(model) -> int:
+    # A session per count, so the counts run concurrently on separate connections.
+    async with db_session() as db:
+        return await db.scalar(select(func.count()).select_from(model))
 
 
 @app.get("/api/stats", response_model=models.Stats)
-def get_stats(db: Session = Depends(get_db)):
-    total_articles = db.query(DBArticle).count()
-    total_sources = db.query(DBSource).count()
-    # Simplified cluster count.
-    total_clusters = db.query(DBAlignment.cluster_id).distinct().count()
-    recent_activity = db.query(DBArticle).order_by(DBArticle.published_at.desc()).limit(5).all()
-    return models.Stats(
-        total_articles=total_articles,
-        total_sources=total_sources,
-        total_clusters=total_clusters,
-        recent_activity=recent_activity,
+async def get_stats(db: AsyncSession = Depends(get_db)):
+    # Noise is never summarized, so the cluster count covers real clusters only.
+    total_articles, total_sources, total_clusters, recent_activity = await asyncio.gather(
+        _count(DBArticle),
+        _count(DBSource),
+        _count(DBClusterSummary),
+        db.execute(
+            select(*article_columns(ARTICLE_SUMMARY_FIELDS)).order_by(DBArticle.published_at.desc()).limit(5)
+        ),
     )
+    return ORJSONResponse({
+        "total_articles": total_articles,
+        "total_sources": total_sources,
+        "total_clusters": total_clusters,
+        "recent_activity": [dict(row) for row in recent_activity.mappings()],
+    })
 
 
-@app.get("/api/search")
-def search(q: str, db: Session = Depends(get_db)):
-    # Placeholder for search functionality
-    return {"results": []}
\ No newline at end of file
+@app.get("/api/search", response_model=models.SearchResults)
+async def search(
+    q: str,
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 20,
+    fuzzy: bool = True,
+):
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    return await search_articles(db, q, skip, min(limit, 100), fuzzy)
@@ -7,13 +7,23 @@ class Fact(BaseModel):
     id: int
     text: str
     source_text: Optional[str]
-    is_quantitative: bool
+    is_quantitative: bool = False # Not stored yet; defaults until extraction records it
     confidence: Optional[float]
 
     class Config:
         orm_mode = True
 
 
+class Source(BaseModel):
+    id: int
+    name: str
+    url: str
+    article_count: int
+
+    class Config:
+        orm_mode = True
+
+
 class Article(BaseModel):
     id: int
     title: str
@@ -45,25 +55,19 @@ class ArticleSummary(BaseModel):
 
 class PaginatedArticles(BaseModel):
     items: List[ArticleSummary]
-    total: int
+    total: Optional[int]
     skip: int
     limit: int
-
-class Source(BaseModel):
-    id: int
-    name: str
-    url: str
-    article_count: int
-
-    class Config:
-        orm_mode = True
-
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None # Set in cursor mode when more items exist
 
 class Cluster(BaseModel):
     id: int
     representative_fact: str
     fact_count: int
     article_count: int
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
 
     class Config:
         orm_mode = True
@@ -73,6 +77,33 @@ class ClusterDetail(Cluster):
     aligned_facts: List[Fact]
 
 
+class SearchHit(BaseModel):
+    id: int
+    title: str
+    url: str
+    source_id: int
+    published_at: datetime
+    rank: float
+    title_highlight: str # HTML-escaped title with matches wrapped in <mark>
+    snippet: Optional[str] # HTML-escaped, like title_highlight
+
+
+class SearchResults(BaseModel):
+    query: str
+    results: List[SearchHit]
+    skip: int
+    limit: int
+    has_more: bool
+    fuzzy: bool # True when results come from the typo-tolerant fallback
+
+
+class SimilarFact(BaseModel):
+    id: int
+    article_id: int
+    text: str
+    similarity: float
+
+
 class Stats(BaseModel):
     total_articles: int
     total_sources: int
@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(published_at: datetime, article_id: int) -> str:
+    raw = json.dumps([published_at.isoformat(), article_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, article_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(published_at), int(article_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def estimate_count(db: AsyncSession, query: Select, filtered: bool) -> Optional[int]:
+    """
+    Cheap row count estimate for a list query.
+
+    Unfiltered queries use the table statistics in pg_class; filtered ones
+    use the planner's row estimate for the query. Both can be off by a few
+    percent but cost no scan.
+    """
+    if not filtered:
+        reltuples = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'article'")
+        )
+        # Tables that were never analyzed report -1 (or 0 before PG 14).
+        if reltuples is not None and reltuples > 0:
+            return int(reltuples)
+
+    # Compiled for the session's driver and run with the query's own bound
+    # parameters, so user input never becomes part of the SQL text.
+    conn = await db.connection()
+    compiled = query.compile(dialect=conn.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+
+from backend.common.db.models import Article as DBArticle, Fact as DBFact, Source as DBSource
+
+# Response fields, in response order. Each list endpoint selects only these
+# columns, so article bodies are never read for list pages.
+ARTICLE_SUMMARY_FIELDS = ("id", "title", "url", "source_id", "published_at", "summary")
+ARTICLE_FIELDS = ARTICLE_SUMMARY_FIELDS + (
+    "flesch_kincaid_grade", "tone", "tone_confidence", "body", "facts", "source",
+)
+ARTICLE_RELATIONSHIPS = ("facts", "source")
+FACT_COLUMNS = (DBFact.id, DBFact.text, DBFact.source_text, DBFact.confidence)
+SOURCE_FIELDS = ("id", "name", "url", "article_count")
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """
+    Resolve a `fields=a,b,c` parameter against the fields a response
+    supports. Without it every field is returned.
+    """
+    if not fields:
+        return list(allowed)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [name for name in allowed if name in requested]
+
+
+def article_columns(names: Sequence[str]) -> List:
+    return [getattr(DBArticle, name) for name in ARTICLE_FIELDS if name in names and name not in ARTICLE_RELATIONSHIPS]
+
+
+def pick(row, names: Sequence[str]) -> Dict:
+    return {name: row[name] for name in names}
+
+
+def fact_dict(fact) -> Dict:
+    return {
+        "id": fact.id,
+        "text": fact.text,
+        "source_text": fact.source_text,
+        "is_quantitative": False, # Not stored yet, see models.Fact
+        "confidence": fact.confidence,
+    }
+
+
+def source_dict(source: Optional[DBSource]) -> Optional[Dict]:
+    if source is None:
+        return None
+    return {name: getattr(source, name) for name in SOURCE_FIELDS}
@@ -0,0 +1,93 @@
+import html
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# ts_headline marks matches with these control characters rather than with
+# HTML, so the stored text can be escaped before they become <mark> tags.
+START_SEL, STOP_SEL = "\x02", "\x03"
+
+# Articles matching the query directly, or through one of their facts.
+# Fact matches count for half as much as a match on the article itself.
+# Headlines are computed in the outer query so only the returned page pays
+# for them.
+FULL_TEXT_SEARCH = text("""
+    WITH q AS (SELECT websearch_to_tsquery('english', :q) AS tsq),
+    hits AS (
+        SELECT id, sum(rank) AS rank FROM (
+            SELECT a.id, ts_rank_cd(a.search_vector, q.tsq) AS rank
+            FROM article a, q
+            WHERE a.search_vector @@ q.tsq
+            UNION ALL
+            SELECT f.article_id, 0.5 * max(ts_rank_cd(f.search_vector, q.tsq))
+            FROM fact f, q
+            WHERE f.search_vector @@ q.tsq
+            GROUP BY f.article_id
+        ) matches
+        GROUP BY id
+    ),
+    page AS (
+        SELECT a.id, a.title, a.body, a.url, a.source_id, a.published_at, hits.rank
+        FROM hits JOIN article a ON a.id = hits.id
+        ORDER BY hits.rank DESC, a.id DESC
+        LIMIT :limit OFFSET :skip
+    )
+    SELECT
+        page.id, page.title, page.url, page.source_id, page.published_at, page.rank,
+        ts_headline('english', page.title, q.tsq,
+                    'HighlightAll=true, StartSel="\x02", StopSel="\x03"') AS title_highlight,
+        ts_headline('english', coalesce(page.body, ''), q.tsq,
+                    'MaxFragments=2, MaxWords=30, MinWords=10, StartSel="\x02", StopSel="\x03"') AS snippet
+    FROM page, q
+    ORDER BY page.rank DESC, page.id DESC
+""")
+
+# Typo-tolerant fallback on titles using the pg_trgm index.
+FUZZY_TITLE_SEARCH = text("""
+    SELECT id, title, url, source_id, published_at,
+           similarity(title, :q) AS rank,
+           title AS title_highlight,
+           left(coalesce(body, ''), 200) AS snippet
+    FROM article
+    WHERE title % :q
+    ORDER BY rank DESC, id DESC
+    LIMIT :limit OFFSET :skip
+""")
+
+
+def highlight_html(value: Optional[str]) -> Optional[str]:
+    """
+    HTML-escape a headline and turn its match markers into <mark> tags.
+    """
+    if value is None:
+        return None
+    return html.escape(value).replace(START_SEL, "<mark>").replace(STOP_SEL, "</mark>")
+
+
+async def search_articles(db: AsyncSession, q: str, skip: int, limit: int, fuzzy: bool) -> Dict:
+    """
+    Ranked full-text search over article titles, bodies and fact text.
+
+    Falls back to trigram matching on titles when `fuzzy` is set and the
+    full-text query matches nothing at all.
+    """
+    params = {"q": q, "skip": skip, "limit": limit + 1}
+    rows: List = (await db.execute(FULL_TEXT_SEARCH, params)).mappings().all()
+    used_fuzzy = False
+
+    if not rows and skip == 0 and fuzzy:
+        rows = (await db.execute(FUZZY_TITLE_SEARCH, params)).mappings().all()
+        used_fuzzy = True
+
+    return {
+        "query": q,
+        "results": [
+            dict(row, title_highlight=highlight_html(row["title_highlight"]), snippet=highlight_html(row["snippet"]))
+            for row in rows[:limit]
+        ],
+        "skip": skip,
+        "limit": limit,
+        "has_more": len(rows) > limit,
+        "fuzzy": used_fuzzy,
+    }
@@ -0,0 +1,86 @@
+"""
+Compare two benchmark result files.
+
+Prints every metric side by side and flags regressions: throughput
+(*_per_second) that dropped, or latency (*_ms), queue lag (*_seconds
+under queue_lag) or peak RSS (*_rss_mb) that grew, by more than the
+threshold.
+
+Usage:
+    python -m backend.benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 10] [--strict]
+"""
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def flatten(data: Dict, prefix: str = "") -> Dict[str, float]:
+    metrics = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+def direction(metric: str) -> Optional[int]:
+    """
+    +1 if higher is better, -1 if lower is better, None if informational.
+    """
+    leaf = metric.rsplit(".", 1)[-1]
+    if leaf.endswith("_per_second"):
+        return 1
+    if leaf.endswith("_ms") or leaf.endswith("_rss_mb") or leaf in ("queue_lag_seconds", "errors"):
+        return -1
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10, help="percent change that counts as a regression")
+    parser.add_argument("--strict", action="store_true", help="exit non-zero if any metric regressed")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    if baseline.get("config") != candidate.get("config"):
+        print("warning: runs used different configurations, comparisons may be meaningless")
+
+    before = flatten(baseline["stages"])
+    after = flatten(candidate["stages"])
+    print(f"baseline  {baseline.get('commit')}\ncandidate {candidate.get('commit')}\n")
+
+    regressions = 0
+    for metric in sorted(before.keys() | after.keys()):
+        old, new = before.get(metric), after.get(metric)
+        if old is None or new is None:
+            print(f"          {metric}: {old} -> {new}")
+            continue
+
+        sign = direction(metric)
+        if old:
+            change = (new - old) / old * 100
+            regressed = sign is not None and -sign * change > args.threshold
+        else:
+            # No relative change from zero; any rise in a lower-is-better
+            # metric such as errors or queue lag counts as a regression.
+            change = math.inf if new > old else 0.0
+            regressed = sign == -1 and new > old
+        regressions += regressed
+        marker = "REGRESSED" if regressed else ""
+        print(f"{marker:<10}{metric}: {old} -> {new} ({change:+.1f}%)")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0f}%")
+    if args.strict and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Local stand-in for the NewsAPI /v2/everything endpoint.
+
+Serves a deterministic feed of synthetic articles, newest first, so the
+ingestion service can be benchmarked without network access or an API key.
+A fraction of the articles reuse the URL of an earlier one, to exercise
+URL deduplication.
+
+Usage:
+    python -m backend.benchmarks.fake_newsapi [--port 8765] [--articles 5000] [--duplicate-rate 0.1]
+
+Point the ingestion service at it with
+NEWSAPI_ENDPOINT=http://127.0.0.1:8765/v2/everything.
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+TOPICS = {
+    "economy": ["inflation", "interest rates", "unemployment", "central bank", "trade deficit"],
+    "politics": ["election", "parliament", "coalition", "referendum", "cabinet"],
+    "technology": ["chip shortage", "AI regulation", "data breach", "satellite launch", "open source"],
+    "climate": ["heatwave", "emissions target", "flooding", "wildfire", "carbon tax"],
+}
+SOURCES = ["Daily Ledger", "Morning Wire", "Civic Times", "Harbor Post", "Metro Herald"]
+# The newest synthetic article; older ones are spaced a minute apart.
+FEED_START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_feed(count: int, duplicate_rate: float, seed: int = 0) -> List[Dict]:
+    """
+    Build `count` NewsAPI-shaped articles. Each one after the first reuses
+    an earlier article's URL with probability `duplicate_rate`.
+    """
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        topic = rng.choice(list(TOPICS))
+        subject = rng.choice(TOPICS[topic])
+        source = rng.choice(SOURCES)
+        url = f"https://bench.example/{topic}/{i}"
+        if i and rng.random() < duplicate_rate:
+            url = articles[rng.randrange(i)]["url"]
+
+        figure = rng.randint(2, 98)
+        articles.append({
+            "source": {"id": None, "name": source},
+            "author": None,
+            "title": f"{source} reports on {subject}: figure reaches {figure}",
+            "description": f"Coverage of {subject} in {topic}.",
+            "url": url,
+            "publishedAt": (FEED_START - timedelta(minutes=i)).isoformat() + "Z",
+            "content": " ".join(
+                f"Officials said {subject} reached {figure} percent this quarter, "
+                f"according to figures cited by {source}."
+                for _ in range(rng.randint(3, 12))
+            ),
+        })
+    return articles
+
+
+class FakeNewsAPIHandler(BaseHTTPRequestHandler):
+    feed: List[Dict] = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/v2/everything":
+            self.send_error(404)
+            return
+
+        params = parse_qs(url.query)
+        page = int(params.get("page", ["1"])[0])
+        page_size = int(params.get("pageSize", ["20"])[0])
+        start = (page - 1) * page_size
+        body = json.dumps({
+            "status": "ok",
+            "totalResults": len(self.feed),
+            "articles": self.feed[start:start + page_size],
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the benchmark output.
+        pass
+
+
+def serve(port: int, articles: int, duplicate_rate: float, seed: int = 0) -> ThreadingHTTPServer:
+    FakeNewsAPIHandler.feed = make_feed(articles, duplicate_rate, seed)
+    return ThreadingHTTPServer(("127.0.0.1", port), FakeNewsAPIHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--articles", type=int, default=5000, help="number of articles in the feed")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="fraction of articles with a repeated URL")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = serve(args.port, args.articles, args.duplicate_rate, args.seed)
+    print(f"Fake NewsAPI serving {args.articles} articles on http://127.0.0.1:{args.port}/v2/everything", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+End-to-end pipeline benchmark.
+
+Serves synthetic articles from a local fake NewsAPI and runs them through
+ingestion -> article queue -> synthesis -> clustering -> API, each stage as
+its own process against the Redis and Postgres configured in .env. Reports
+articles per second per stage, queue lag, per-endpoint API latency
+percentiles and peak RSS per stage, and writes them to a JSON file that
+backend.benchmarks.compare can diff against another run.
+
+The run starts by clearing Redis and every table the pipeline writes, so
+point DB_* and REDIS_* at disposable instances migrated to head
+(alembic upgrade head) and pass --reset to confirm. Synthesis only runs
+alongside ingestion; without ingestion, later stages rerun on the articles
+of the previous run.
+Synthesis does not extract facts yet, so the clustering stage runs on
+synthetic facts seeded from the stored articles.
+
+Usage:
+    python -m backend.benchmarks.run --reset [--articles 5000] [--duplicate-rate 0.1]
+        [--stages ingestion,synthesis,processing,api] [--output PATH]
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import redis
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+REPO_DIR = BACKEND_DIR.parent
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+
+STAGES = ("ingestion", "synthesis", "processing", "api")
+# Tables written by clustering, and by the whole pipeline.
+CLUSTERING_TABLES = ("alignment", "cluster_summary", "cluster_centroid", "embedding_cache", "fact")
+PIPELINE_TABLES = CLUSTERING_TABLES + ("article", "source")
+API_ENDPOINTS = [
+    "/api/stats",
+    "/api/sources",
+    "/api/articles",
+    "/api/articles?paginate=cursor",
+    "/api/articles/{article_id}",
+    "/api/clusters",
+    "/api/search?q=inflation",
+]
+# Synthetic facts per stored article for the clustering stage. The text is
+# built from the article's subject so related facts actually cluster.
+SEED_FACTS = text("""
+    INSERT INTO fact (article_id, text, confidence)
+    SELECT a.id,
+           'Officials said ' || split_part(split_part(a.title, ' reports on ', 2), ':', 1)
+               || ' changed this quarter (claim ' || g || ')',
+           1
+    FROM article a, generate_series(1, :per_article) AS g
+""")
+SAMPLE_INTERVAL = 0.1
+
+
+def get_db_url():
+    return f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASS')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME')}"
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_peak_rss_kb(pid: int) -> int:
+    """
+    High-water resident set size of a live process (Linux only, else 0).
+    """
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+def wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout:.0f}s")
+
+
+class StageProcess:
+    """
+    A pipeline stage running as a child process, with its output sent to a
+    log file and its peak RSS sampled until it exits.
+    """
+
+    def __init__(self, name: str, args: List[str], cwd: Path, env: Dict[str, str], log_dir: Path):
+        self.name = name
+        self.log_path = log_dir / f"{name}.log"
+        self._log = open(self.log_path, "w")
+        self.proc = subprocess.Popen(
+            [sys.executable, *args], cwd=cwd, env=env, stdout=self._log, stderr=subprocess.STDOUT
+        )
+        self.peak_rss_kb = 0
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+
+    def _sample(self):
+        while self.proc.poll() is None:
+            self.peak_rss_kb = max(self.peak_rss_kb, read_peak_rss_kb(self.proc.pid))
+            time.sleep(0.05)
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return round(self.peak_rss_kb / 1024, 1)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        returncode = self.proc.wait(timeout)
+        self._finish()
+        if returncode != 0:
+            raise RuntimeError(f"{self.name} exited with {returncode}, see {self.log_path}")
+        return returncode
+
+    def stop(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self._finish()
+
+    def _finish(self):
+        self._sampler.join()
+        self._log.close()
+
+    def output(self) -> str:
+        return self.log_path.read_text()
+
+
+class Benchmark:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.engine = create_engine(get_db_url())
+        self.redis = redis.Redis(host=os.getenv("REDIS_HOST", "redis"), port=int(os.getenv("REDIS_PORT", 6379)))
+        self.log_dir = args.output.parent / "logs"
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.fact_index_path = args.output.parent / f"{args.output.stem}.fact_index.bin"
+        self.env = self._stage_env()
+        self.results: Dict[str, Dict] = {}
+
+    def _stage_env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update({
+            "ENABLED_SOURCES": "newsapi",
+            "NEWS_API_KEY": "benchmark",
+            "NEWSAPI_ENDPOINT": f"http://127.0.0.1:{self.args.newsapi_port}/v2/everything",
+            "NEWSAPI_PAGE_SIZE": "100",
+            "NEWSAPI_MAX_PAGES": str(math.ceil(self.args.articles / 100)),
+            "NEWSAPI_RATE_PER_SECOND": "1000",
+            "NEWSAPI_BURST": "1000",
+            "DATABASE_URL": get_db_url(),
+            "API_CACHE_ENABLED": "true" if self.args.api_cache else "false",
+            # Nothing listens for processing triggers during a benchmark.
+            "PROCESSING_TRIGGER_THRESHOLD": "0",
+            # Next to the results rather than the container default in /data.
+            "FACT_INDEX_PATH": str(self.fact_index_path),
+        })
+        return env
+
+    def scalar(self, sql: str) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(text(sql)).scalar() or 0
+
+    def queue_depth(self) -> int:
+        # Imported late: the queue backend is chosen from the environment at import.
+        from backend.common.queue import ARTICLE_QUEUE
+
+        return ARTICLE_QUEUE.qsize()
+
+    def truncate(self, tables) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+
+    def run(self) -> Dict:
+        stages = self.args.stages
+        # Without ingestion, later stages rerun on the articles of the previous run.
+        if "ingestion" in stages:
+            self.truncate(PIPELINE_TABLES)
+            self.redis.flushdb()
+            self.run_ingestion_and_synthesis()
+        if "processing" in stages:
+            self.run_processing()
+        if "api" in stages:
+            self.run_api()
+        return {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "config": {
+                "articles": self.args.articles,
+                "duplicate_rate": self.args.duplicate_rate,
+                "facts_per_article": self.args.facts_per_article,
+                "api_requests": self.args.api_requests,
+                "api_concurrency": self.args.api_concurrency,
+                "api_cache": self.args.api_cache,
+                "queue_backend": os.getenv("QUEUE_BACKEND", "list"),
+                "synthesis_mode": os.getenv("SYNTHESIS_MODE", "single"),
+            },
+            "stages": self.results,
+        }
+
+    def run_ingestion_and_synthesis(self) -> None:
+        """
+        Run synthesis alongside ingestion, as in production, and sample the
+        queue depth and stored article count until synthesis has drained
+        the queue.
+        """
+        fake = StageProcess(
+            "fake_newsapi",
+            [
+                "-m", "backend.benchmarks.fake_newsapi",
+                "--port", str(self.args.newsapi_port),
+                "--articles", str(self.args.articles),
+                "--duplicate-rate", str(self.args.duplicate_rate),
+            ],
+            REPO_DIR, self.env, self.log_dir,
+        )
+        synthesis = None
+        try:
+            wait_for_port(self.args.newsapi_port, 30)
+            if "synthesis" in self.args.stages:
+                # Started first so it consumes while ingestion is still queueing.
+                synthesis = StageProcess("synthesis", ["-m", "synthesis_service.run"], BACKEND_DIR, self.env, self.log_dir)
+
+            samples = []
+            stop_sampling = threading.Event()
+
+            def sample():
+                while not stop_sampling.is_set():
+                    samples.append((time.monotonic(), self.queue_depth(), self.scalar("SELECT count(*) FROM article")))
+                    time.sleep(SAMPLE_INTERVAL)
+
+            sampler = threading.Thread(target=sample, daemon=True)
+            sampler.start()
+
+            started = time.monotonic()
+            ingestion = StageProcess("ingestion", ["-m", "ingestion_service.run"], BACKEND_DIR, self.env, self.log_dir)
+            ingestion.wait(self.args.timeout)
+            ingested_at = time.monotonic()
+            match = re.search(r"Ingestion complete: (\d+) articles", ingestion.output())
+            queued = int(match.group(1)) if match else 0
+            self.results["ingestion"] = {
+                "articles": queued,
+                "seconds": round(ingested_at - started, 3),
+                "articles_per_second": round(queued / max(ingested_at - started, 1e-9), 1),
+                "peak_rss_mb": ingestion.peak_rss_mb,
+            }
+
+            if synthesis is not None:
+                self._wait_for_drain(samples, ingested_at)
+            stop_sampling.set()
+            sampler.join()
+
+            if synthesis is not None:
+                self.results["synthesis"] = self._synthesis_result(samples, started, ingested_at)
+                self.results["synthesis"]["peak_rss_mb"] = synthesis.peak_rss_mb
+        finally:
+            if synthesis is not None:
+                synthesis.stop()
+            fake.stop()
+
+    def _wait_for_drain(self, samples: List, ingested_at: float) -> None:
+        # Drained once the queue is empty and the article count has not
+        # moved for `settle` seconds.
+        deadline = ingested_at + self.args.timeout
+        while time.monotonic() < deadline:
+            time.sleep(SAMPLE_INTERVAL)
+            recent = [s for s in samples if s[0] >= time.monotonic() - self.args.settle]
+            if (
+                recent
+                and time.monotonic() - ingested_at >= self.args.settle
+                and all(depth == 0 for _, depth, _ in recent)
+                and len({count for _, _, count in recent}) == 1
+            ):
+                return
+        raise RuntimeError(f"Synthesis did not drain the queue within {self.args.timeout:.0f}s")
+
+    def _synthesis_result(self, samples: List, started: float, ingested_at: float) -> Dict:
+        # Write times are known to within one sample interval.
+        stored = samples[-1][2]
+        first = next((i for i, (_, _, count) in enumerate(samples) if count > 0), 0)
+        first_write = samples[first - 1][0] if first else started
+        last_write = next(t for t, _, count in samples if count == stored)
+        elapsed = max(last_write - first_write, SAMPLE_INTERVAL)
+        return {
+            "articles": stored,
+            "seconds": round(elapsed, 3),
+            "articles_per_second": round(stored / elapsed, 1),
+            "max_queue_depth": max(depth for _, depth, _ in samples),
+            # From the last article queued to the last article stored.
+            "queue_lag_seconds": round(max(last_write - ingested_at, 0), 3),
+        }
+
+    def run_processing(self) -> None:
+        self.truncate(CLUSTERING_TABLES)
+        # An index left by an earlier run holds fact ids that no longer exist.
+        for path in (self.fact_index_path, self.fact_index_path.with_name(f"{self.fact_index_path.name}.json")):
+            path.unlink(missing_ok=True)
+        with self.engine.begin() as conn:
+            conn.execute(SEED_FACTS, {"per_article": self.args.facts_per_article})
+        facts = self.scalar("SELECT count(*) FROM fact")
+
+        started = time.monotonic()
+        processing = StageProcess(
+            "processing", ["-m", "backend.processing.run", "incremental"], REPO_DIR, self.env, self.log_dir
+        )
+        processing.wait(self.args.timeout)
+        elapsed = time.monotonic() - started
+        self.results["processing"] = {
+            "facts": facts,
+            "clusters": self.scalar("SELECT count(*) FROM cluster_summary"),
+            "seconds": round(elapsed, 3),
+            "facts_per_second": round(facts / elapsed, 1),
+            "peak_rss_mb": processing.peak_rss_mb,
+        }
+
+    def run_api(self) -> None:
+        api = StageProcess(
+            "api",
+            [
+                "-m", "uvicorn", "backend.api_service.main:app",
+                "--host", "127.0.0.1", "--port", str(self.args.api_port), "--log-level", "warning",
+            ],
+            REPO_DIR, self.env, self.log_dir,
+        )
+        try:
+            wait_for_port(self.args.api_port, 60)
+            article_id = self.scalar("SELECT min(id) FROM article")
+            endpoints = [path.format(article_id=article_id) for path in API_ENDPOINTS]
+            self.results["api"] = {"endpoints": asyncio.run(self._load_api(endpoints))}
+        finally:
+            api.stop()
+        self.results["api"]["peak_rss_mb"] = api.peak_rss_mb
+
+    async def _load_api(self, endpoints: List[str]) -> Dict[str, Dict]:
+        limits = httpx.Limits(max_connections=self.args.api_concurrency)
+        base_url = f"http://127.0.0.1:{self.args.api_port}"
+        results = {}
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            for path in endpoints:
+                # Warm up connections, the ORM and (when enabled) the cache.
+                for _ in range(5):
+                    try:
+                        await client.get(path)
+                    except httpx.HTTPError:
+                        pass
+
+                latencies: List[float] = []
+                errors = 0
+                semaphore = asyncio.Semaphore(self.args.api_concurrency)
+
+                async def request():
+                    nonlocal errors
+                    async with semaphore:
+                        started = time.perf_counter()
+                        try:
+                            response = await client.get(path)
+                        except httpx.HTTPError:
+                            # Timeouts and resets count as failed requests, not a failed run.
+                            errors += 1
+                            return
+                        latencies.append((time.perf_counter() - started) * 1000)
+                        if response.status_code != 200:
+                            errors += 1
+
+                started = time.perf_counter()
+                await asyncio.gather(*(request() for _ in range(self.args.api_requests)))
+                elapsed = time.perf_counter() - started
+                results[path] = {
+                    "requests": self.args.api_requests,
+                    "errors": errors,
+                    "requests_per_second": round(len(latencies) / elapsed, 1),
+                }
+                if latencies:
+                    results[path].update({
+                        "p50_ms": round(percentile(latencies, 50), 2),
+                        "p95_ms": round(percentile(latencies, 95), 2),
+                        "p99_ms": round(percentile(latencies, 99), 2),
+                    })
+                print(f"{path}: {errors} errors, p50 {results[path].get('p50_ms')} ms, p99 {results[path].get('p99_ms')} ms")
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reset", action="store_true", help="confirm that the database and Redis may be cleared")
+    parser.add_argument("--articles", type=int, default=5000, help="articles served by the fake NewsAPI")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="fraction of articles with a repeated URL")
+    parser.add_argument("--facts-per-article", type=int, default=3, help="synthetic facts seeded for clustering")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages to run")
+    parser.add_argument("--api-requests", type=int, default=500, help="requests per API endpoint")
+    parser.add_argument("--api-concurrency", type=int, default=20)
+    parser.add_argument("--no-api-cache", dest="api_cache", action="store_false", help="disable the API response cache")
+    parser.add_argument("--newsapi-port", type=int, default=8765)
+    parser.add_argument("--api-port", type=int, default=8799)
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds without progress that mark the queue drained")
+    parser.add_argument("--timeout", type=float, default=1800, help="per-stage timeout in seconds")
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+
+    if not args.reset:
+        parser.error("the benchmark clears the database and Redis; pass --reset to confirm")
+    args.stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(args.stages).difference(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    load_dotenv()
+    commit = git_commit()
+    args.output = args.output or RESULTS_DIR / f"{(commit or 'unknown')[:12]}.json"
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+
+    results = Benchmark(args).run()
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    print(json.dumps(results["stages"], indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
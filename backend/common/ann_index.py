@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import hnswlib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FACT_INDEX_PATH = os.getenv("FACT_INDEX_PATH", "/data/fact_index.bin")
+FACT_INDEX_M = int(os.getenv("FACT_INDEX_M", "16"))
+FACT_INDEX_EF_CONSTRUCTION = int(os.getenv("FACT_INDEX_EF_CONSTRUCTION", "200"))
+FACT_INDEX_EF_SEARCH = int(os.getenv("FACT_INDEX_EF_SEARCH", "64"))
+FACT_INDEX_INITIAL_CAPACITY = int(os.getenv("FACT_INDEX_INITIAL_CAPACITY", "100000"))
+
+
+class FactIndex:
+    """
+    HNSW index over fact embeddings, labelled by `fact.id`.
+
+    The graph lives in `path` with a small JSON sidecar (`path + ".json"`)
+    recording its dimension and model. Saves go to temporary files that are
+    renamed into place, the index before its sidecar, so readers never see
+    a half-written index and a changed sidecar means both files are new.
+    """
+
+    def __init__(self, path: str = FACT_INDEX_PATH):
+        self.path = path
+        self.meta_path = f"{path}.json"
+        self.index: Optional[hnswlib.Index] = None
+        self.model_name: Optional[str] = None
+        # Whether vectors were added since the last save.
+        self.dirty = False
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path) and os.path.exists(self.meta_path)
+
+    def load(self) -> "FactIndex":
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        self.model_name = meta["model_name"]
+        self.index = hnswlib.Index(space="cosine", dim=meta["dim"])
+        self.index.load_index(self.path, allow_replace_deleted=True)
+        self.index.set_ef(FACT_INDEX_EF_SEARCH)
+        return self
+
+    def create(self, dim: int, model_name: str) -> "FactIndex":
+        self.model_name = model_name
+        self.index = hnswlib.Index(space="cosine", dim=dim)
+        self.index.init_index(
+            max_elements=FACT_INDEX_INITIAL_CAPACITY,
+            ef_construction=FACT_INDEX_EF_CONSTRUCTION,
+            M=FACT_INDEX_M,
+            allow_replace_deleted=True,
+        )
+        self.index.set_ef(FACT_INDEX_EF_SEARCH)
+        return self
+
+    @classmethod
+    def open(cls, dim: int, model_name: str, path: str = FACT_INDEX_PATH) -> "FactIndex":
+        """
+        Load the index at `path`, or create an empty one if there is none
+        or it was built with a different model.
+        """
+        fact_index = cls(path)
+        if fact_index.exists():
+            fact_index.load()
+            if fact_index.model_name == model_name and fact_index.index.dim == dim:
+                return fact_index
+            logger.warning("Fact index at %s was built for another model, recreating", path)
+        return fact_index.create(dim, model_name)
+
+    def __len__(self) -> int:
+        return self.index.get_current_count() if self.index is not None else 0
+
+    def add(self, fact_ids: Sequence[int], embeddings: np.ndarray) -> None:
+        """
+        Insert or update the vectors of the given facts.
+        """
+        if not len(fact_ids):
+            return
+        needed = self.index.get_current_count() + len(fact_ids)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, self.index.get_max_elements() * 2))
+        self.index.add_items(np.asarray(embeddings, dtype=np.float32), np.asarray(fact_ids, dtype=np.int64))
+        self.dirty = True
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        self.index.save_index(tmp_path)
+        with open(f"{self.meta_path}.tmp", "w") as f:
+            json.dump({"dim": self.index.dim, "model_name": self.model_name, "count": len(self)}, f)
+        os.replace(tmp_path, self.path)
+        os.replace(f"{self.meta_path}.tmp", self.meta_path)
+        self.dirty = False
+        logger.info("Saved fact index with %d vectors to %s", len(self), self.path)
+
+    def query(self, embeddings: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (fact_ids, cosine similarities) of the k nearest neighbours
+        of each row of `embeddings`.
+        """
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty((len(embeddings), 0), dtype=np.int64), np.empty((len(embeddings), 0))
+        labels, distances = self.index.knn_query(np.asarray(embeddings, dtype=np.float32), k=k)
+        return labels, 1.0 - distances
+
+    def similar_to(self, fact_id: int, k: int) -> List[Tuple[int, float]]:
+        """
+        The k facts most similar to an indexed fact, excluding itself.
+        """
+        try:
+            vector = np.asarray(self.index.get_items([fact_id]), dtype=np.float32)
+        except RuntimeError:
+            return []
+        labels, similarities = self.query(vector, k + 1)
+        return [
+            (int(label), float(similarity))
+            for label, similarity in zip(labels[0], similarities[0])
+            if label != fact_id
+        ][:k]
+
+
+class FactIndexReader:
+    """
+    Read-only, thread-safe handle for serving queries from another process.
+
+    The index is reloaded when the writer has replaced its sidecar, which
+    happens last on every save, checked at most every `check_interval`
+    seconds.
+    """
+
+    def __init__(self, path: str = FACT_INDEX_PATH, check_interval: float = 30.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._index: Optional[FactIndex] = None
+        self._mtime = 0.0
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[FactIndex]:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._index
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(f"{self.path}.json")
+            except OSError:
+                return self._index
+            if mtime != self._mtime:
+                fact_index = FactIndex(self.path)
+                if fact_index.exists():
+                    self._index = fact_index.load()
+                    self._mtime = mtime
+                    logger.info("Loaded fact index with %d vectors", len(self._index))
+        return self._index
@@ -1,15 +1,20 @@
 from sqlalchemy import (
     Column,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
+    Sequence,
     String,
     Text,
     create_engine,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.sql import func
 
 Base = declarative_base()
 
@@ -27,10 +32,30 @@ class Article(Base):
     tone = Column(String)
     tone_confidence = Column(Float)
     flesch_kincaid_grade = Column(Float)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+            persisted=True,
+        ),
+    )
 
     source = relationship("Source", back_populates="articles")
     facts = relationship("Fact", back_populates="article")
 
+    __table_args__ = (
+        Index("ix_article_published_at_id", published_at.desc(), id.desc()),
+        Index("ix_article_source_id_published_at_id", source_id, published_at.desc(), id.desc()),
+        Index("ix_article_search_vector", search_vector, postgresql_using="gin"),
+        Index(
+            "ix_article_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
+
 
 class Source(Base):
     __tablename__ = "source"
@@ -38,6 +63,8 @@ class Source(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False, unique=True)
     url = Column(String, nullable=False)
+    # Maintained by the synthesis write path so reads never need COUNT(*).
+    article_count = Column(Integer, nullable=False, server_default="0")
 
     articles = relationship("Article", back_populates="source")
 
@@ -46,23 +73,69 @@ class Fact(Base):
     __tablename__ = "fact"
 
     id = Column(Integer, primary_key=True)
-    article_id = Column(Integer, ForeignKey("article.id"), nullable=False)
+    article_id = Column(Integer, ForeignKey("article.id"), nullable=False, index=True)
     text = Column(Text, nullable=False)
     source_text = Column(Text)
     confidence = Column(Integer, default=0)
     entities = Column(JSONB)
     relationships = Column(JSONB)
     metadata_ = Column(JSONB)
+    search_vector = Column(TSVECTOR, Computed("to_tsvector('english', text)", persisted=True))
 
     article = relationship("Article", back_populates="facts")
     alignments = relationship("Alignment", back_populates="fact")
 
+    __table_args__ = (
+        Index("ix_fact_search_vector", search_vector, postgresql_using="gin"),
+    )
+
 
 class Alignment(Base):
     __tablename__ = "alignment"
 
     id = Column(Integer, primary_key=True)
-    fact_id = Column(Integer, ForeignKey("fact.id"), nullable=False)
-    cluster_id = Column(String, nullable=False)
+    fact_id = Column(Integer, ForeignKey("fact.id"), nullable=False, unique=True)
+    cluster_id = Column(String, nullable=False, index=True)
 
     fact = relationship("Fact", back_populates="alignments")
+
+
+class EmbeddingCache(Base):
+    __tablename__ = "embedding_cache"
+
+    model_name = Column(String, primary_key=True)
+    text_hash = Column(String(64), primary_key=True)
+    dim = Column(Integer, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)
+    last_used_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)
+
+
+# Source of new cluster ids; noise is "-1" and never comes from here.
+cluster_id_seq = Sequence("cluster_id_seq", metadata=Base.metadata)
+
+
+class ClusterCentroid(Base):
+    __tablename__ = "cluster_centroid"
+
+    cluster_id = Column(String, primary_key=True)
+    model_name = Column(String, nullable=False)
+    centroid = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class ClusterSummary(Base):
+    __tablename__ = "cluster_summary"
+
+    cluster_id = Column(String, primary_key=True)
+    representative_fact_id = Column(Integer, ForeignKey("fact.id", ondelete="SET NULL"))
+    representative_fact = Column(Text, nullable=False)
+    fact_count = Column(Integer, nullable=False)
+    article_count = Column(Integer, nullable=False)
+    first_seen = Column(DateTime)
+    last_seen = Column(DateTime)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_cluster_summary_last_seen", last_seen.desc(), cluster_id),
+    )
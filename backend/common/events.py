@@ -0,0 +1,20 @@
+import redis
+
+# Monotonic counter bumped whenever stored data visible through the API changes.
+DATA_VERSION_KEY = "data:version"
+# Pub/sub channel carrying the new version after each bump.
+DATA_CHANGED_CHANNEL = "data:changed"
+
+
+def publish_data_change(client: redis.Redis) -> int:
+    """
+    Bump the data version and announce it. Readers that key their caches
+    on the version drop every stale entry at once, without deleting keys.
+    """
+    version = client.incr(DATA_VERSION_KEY)
+    client.publish(DATA_CHANGED_CHANNEL, version)
+    return version
+
+
+def get_data_version(client: redis.Redis) -> int:
+    return int(client.get(DATA_VERSION_KEY) or 0)
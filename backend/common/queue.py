@@ -1,15 +1,42 @@
 import redis
-import json
+import logging
 import os
-from .json_encoder import CustomJSONEncoder
+import socket
+import time
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+from .serializers import DeserializationError, Serializer, get_serializer
+
+logger = logging.getLogger(__name__)
 
 class RedisQueue:
-    def __init__(self, name, **redis_kwargs):
+    # Upper bound on values sent in a single RPUSH by put_many.
+    PUSH_CHUNK_SIZE = 500
+    # Popped items are gone; nothing is redelivered unless requeued.
+    REDELIVERS = False
+
+    def __init__(self, name, serializer: Optional[Serializer] = None, **redis_kwargs):
         self.key = f"queue:{name}"
+        self.dead_letter_key = f"queue:{name}:dead"
+        self.serializer = serializer or get_serializer()
         self.redis = redis.Redis(**redis_kwargs)
 
     def put(self, item):
-        self.redis.rpush(self.key, json.dumps(item, cls=CustomJSONEncoder))
+        self.redis.rpush(self.key, self.serializer.dumps(item))
+
+    def put_many(self, items: Iterable[Any]) -> int:
+        """
+        Push items with multi-value RPUSH, pipelining the chunks so the
+        whole batch costs a single round-trip.
+        """
+        payloads = [self.serializer.dumps(item) for item in items]
+        if not payloads:
+            return 0
+
+        pipe = self.redis.pipeline(transaction=False)
+        for start in range(0, len(payloads), self.PUSH_CHUNK_SIZE):
+            pipe.rpush(self.key, *payloads[start:start + self.PUSH_CHUNK_SIZE])
+        pipe.execute()
+        return len(payloads)
 
     def get(self, block=True, timeout=None):
         if block:
@@ -18,10 +45,277 @@ class RedisQueue:
             item = self.redis.lpop(self.key)
 
         if item:
-            return json.loads(item[1]) if block else json.loads(item)
+            items = self._decode([item[1] if block else item])
+            return items[0] if items else None
         return None
 
+    def get_many(self, count: int, block=True, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Pop up to `count` items in one round-trip.
+
+        When blocking, waits up to `timeout` seconds (forever if None) for
+        at least one item, then returns whatever is available up to `count`.
+        """
+        if block:
+            result = self.redis.blmpop(timeout or 0, 1, self.key, direction="LEFT", count=count)
+            items = result[1] if result else []
+        else:
+            items = self.redis.lpop(self.key, count) or []
+
+        return self._decode(items)
+
+    def _decode(self, payloads: Sequence[bytes]) -> List[Any]:
+        """
+        Decode popped payloads, moving undecodable ones to the dead-letter list.
+        """
+        items = []
+        for payload in payloads:
+            try:
+                items.append(self.serializer.loads(payload))
+            except DeserializationError as e:
+                logger.error("Undecodable message on %s: %s", self.key, e)
+                self.redis.rpush(self.dead_letter_key, payload)
+        return items
+
+    def receive(self, count: int, block=True, timeout: Optional[float] = None) -> List[Tuple[Optional[str], Any]]:
+        """
+        Like get_many, but returns (message_id, item) pairs for use with ack.
+        Plain lists have no delivery tracking, so the ids are always None.
+        """
+        return [(None, item) for item in self.get_many(count, block=block, timeout=timeout)]
+
+    def ack(self, ids: Optional[Sequence[Optional[str]]] = None) -> None:
+        # Items are removed from the list as soon as they are popped.
+        pass
+
+    def requeue(self, entries: Sequence[Tuple[Optional[str], Any]]) -> None:
+        """
+        Put received items back after a failure that may succeed on retry.
+        Popped items are otherwise gone, so this is the only redelivery.
+        """
+        self.put_many(item for _, item in entries)
+
+    def dead_letter(self, entries: Sequence[Tuple[Optional[str], Any]]) -> None:
+        """
+        Move received items that can never be processed to the dead-letter list.
+        """
+        payloads = [self.serializer.dumps(item) for _, item in entries]
+        if payloads:
+            self.redis.rpush(self.dead_letter_key, *payloads)
+            logger.error("Moved %d messages to %s", len(payloads), self.dead_letter_key)
+
+    def qsize(self) -> int:
+        return self.redis.llen(self.key)
+
+
+class RedisStreamQueue:
+    """
+    At-least-once queue on Redis Streams with a consumer group.
+
+    Exposes the same interface as RedisQueue. Items handed out by get,
+    get_many or receive stay pending until acknowledged with ack(); items
+    held by a crashed consumer are reclaimed with XAUTOCLAIM once idle for
+    `claim_idle_ms`, and moved to a dead-letter stream after
+    `max_deliveries` attempts.
+    """
+
+    REDELIVERS = True
+
+    def __init__(
+        self,
+        name,
+        group="workers",
+        consumer=None,
+        maxlen=100_000,
+        claim_idle_ms=60_000,
+        max_deliveries=5,
+        serializer: Optional[Serializer] = None,
+        **redis_kwargs,
+    ):
+        self.key = f"stream:{name}"
+        self.dead_letter_key = f"stream:{name}:dead"
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.maxlen = maxlen
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self.serializer = serializer or get_serializer()
+        self.redis = redis.Redis(**redis_kwargs)
+        self._pending: List[bytes] = []
+        self._group_ready = False
+        self._next_claim = 0.0
+        # Where the next XAUTOCLAIM resumes in the pending entries list.
+        self._claim_cursor = "0-0"
+
+    def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            self.redis.xgroup_create(self.key, self.group, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def put(self, item):
+        self.redis.xadd(
+            self.key,
+            {"data": self.serializer.dumps(item)},
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+
+    def put_many(self, items: Iterable[Any]) -> int:
+        pipe = self.redis.pipeline(transaction=False)
+        count = 0
+        for item in items:
+            pipe.xadd(
+                self.key,
+                {"data": self.serializer.dumps(item)},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+            count += 1
+        if count:
+            pipe.execute()
+        return count
+
+    def get(self, block=True, timeout=None):
+        items = self.get_many(1, block=block, timeout=timeout)
+        return items[0] if items else None
+
+    def get_many(self, count: int, block=True, timeout: Optional[float] = None) -> List[Any]:
+        entries = self.receive(count, block=block, timeout=timeout)
+        self._pending.extend(message_id for message_id, _ in entries)
+        return [item for _, item in entries]
+
+    def receive(self, count: int, block=True, timeout: Optional[float] = None) -> List[Tuple[bytes, Any]]:
+        self._ensure_group()
+
+        messages = self._claim_stale(count)
+        if not messages:
+            # BLOCK 0 waits forever, so never round a short timeout down to 0.
+            block_ms = (max(int(timeout * 1000), 1) if timeout else 0) if block else None
+            response = self.redis.xreadgroup(
+                self.group, self.consumer, {self.key: ">"}, count=count, block=block_ms
+            )
+            messages = response[0][1] if response else []
+
+        entries = []
+        for message_id, fields in messages:
+            try:
+                entries.append((message_id, self.serializer.loads(fields[b"data"])))
+            except (KeyError, DeserializationError) as e:
+                logger.error("Undecodable message %s on %s: %s", message_id, self.key, e)
+                self._dead_letter(message_id, fields, deliveries=1)
+        return entries
+
+    def _claim_stale(self, count: int):
+        # Reclaiming costs a round-trip, so only start a sweep of the
+        # pending entries about twice per idle window. A sweep resumes where
+        # the last call stopped, so entries past the first `count` are
+        # reached too.
+        now = time.monotonic()
+        if self._claim_cursor == "0-0" and now < self._next_claim:
+            return []
+
+        response = self.redis.xautoclaim(
+            self.key, self.group, self.consumer, self.claim_idle_ms, start_id=self._claim_cursor, count=count
+        )
+        cursor = response[0]
+        self._claim_cursor = cursor.decode() if isinstance(cursor, bytes) else cursor
+        if self._claim_cursor == "0-0":
+            self._next_claim = now + self.claim_idle_ms / 2000
+        claimed = [(message_id, fields) for message_id, fields in response[1] if fields]
+        if not claimed:
+            return []
+
+        deliveries = {
+            entry["message_id"]: entry["times_delivered"]
+            for entry in self.redis.xpending_range(
+                self.key,
+                self.group,
+                min=claimed[0][0],
+                max=claimed[-1][0],
+                count=len(claimed),
+                consumername=self.consumer,
+            )
+        }
+
+        live = []
+        for message_id, fields in claimed:
+            times_delivered = deliveries.get(message_id, 1)
+            if times_delivered > self.max_deliveries:
+                self._dead_letter(message_id, fields, times_delivered)
+            else:
+                live.append((message_id, fields))
+        if live:
+            logger.warning("Reclaimed %d stale messages on %s", len(live), self.key)
+        return live
+
+    def _dead_letter(self, message_id, fields, deliveries: int):
+        pipe = self.redis.pipeline()
+        pipe.xadd(
+            self.dead_letter_key,
+            {
+                "data": fields.get(b"data", b""),
+                "original_id": message_id,
+                "deliveries": deliveries,
+            },
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+        pipe.xack(self.key, self.group, message_id)
+        pipe.execute()
+        logger.error("Moved message %s to %s", message_id, self.dead_letter_key)
+
+    def requeue(self, entries: Sequence[Tuple[bytes, Any]]) -> None:
+        # Unacknowledged entries are reclaimed and redelivered already.
+        pass
+
+    def dead_letter(self, entries: Sequence[Tuple[bytes, Any]]) -> None:
+        """
+        Move received entries that can never be processed to the dead-letter stream.
+        """
+        for message_id, item in entries:
+            self._dead_letter(message_id, {b"data": self.serializer.dumps(item)}, deliveries=1)
+
+    def ack(self, ids: Optional[Sequence[bytes]] = None) -> None:
+        """
+        Acknowledge the given message ids, or everything handed out by
+        get/get_many since the last ack() when called without arguments.
+        """
+        if ids is None:
+            ids, self._pending = self._pending, []
+        ids = [message_id for message_id in ids if message_id is not None]
+        if ids:
+            self.redis.xack(self.key, self.group, *ids)
+
+    def qsize(self) -> int:
+        """
+        Entries not yet delivered to the consumer group.
+        """
+        self._ensure_group()
+        for info in self.redis.xinfo_groups(self.key):
+            if info["name"] in (self.group, self.group.encode()) and info.get("lag") is not None:
+                return int(info["lag"])
+        return self.redis.xlen(self.key)
+
 # Global Redis queue instance for articles
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
-ARTICLE_QUEUE = RedisQueue("articles", host=REDIS_HOST, port=REDIS_PORT)
\ No newline at end of file
+# "list" (RedisQueue) or "stream" (RedisStreamQueue, for multiple consumers)
+QUEUE_BACKEND = os.getenv("QUEUE_BACKEND", "list")
+
+if QUEUE_BACKEND == "stream":
+    ARTICLE_QUEUE = RedisStreamQueue(
+        "articles",
+        group="synthesis",
+        maxlen=int(os.getenv("QUEUE_STREAM_MAXLEN", 100_000)),
+        claim_idle_ms=int(os.getenv("QUEUE_CLAIM_IDLE_MS", 60_000)),
+        max_deliveries=int(os.getenv("QUEUE_MAX_DELIVERIES", 5)),
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+    )
+else:
+    ARTICLE_QUEUE = RedisQueue("articles", host=REDIS_HOST, port=REDIS_PORT)
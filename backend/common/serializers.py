@@ -0,0 +1,175 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+from .json_encoder import CustomJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+
+# Framed payloads start with a byte that can never begin a JSON document, so
+# they can be told apart from legacy (unframed) JSON payloads.
+MAGIC = 0xF1
+VERSION = 1
+
+FORMATS = {"json": 0, "msgpack": 1}
+COMPRESSIONS = {"none": 0, "zstd": 1, "lz4": 2}
+
+
+class DeserializationError(ValueError):
+    """
+    A payload that cannot be decoded: corrupt, truncated or of an
+    unsupported version. Retrying will not help.
+    """
+
+
+class Serializer:
+    """
+    Versioned encoder for queue payloads.
+
+    Payloads are either legacy JSON documents or a 4-byte header
+    (magic, version, format, compression) followed by the body. Every
+    Serializer decodes both, whatever it is configured to write, so producers
+    and consumers can be switched over independently. A serializer
+    configured as plain JSON without compression writes the legacy format,
+    which keeps it readable by consumers that predate the header.
+
+    Datetimes are written as ISO 8601 strings in every format.
+    """
+
+    def __init__(self, fmt: str = "json", compression: str = "none", compress_threshold: int = 1024):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown queue format: {fmt}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown queue compression: {compression}")
+        if fmt == "msgpack" and msgpack is None:
+            raise ValueError("Queue format 'msgpack' requires the msgpack package")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("Queue compression 'zstd' requires the zstandard package")
+        if compression == "lz4" and lz4_frame is None:
+            raise ValueError("Queue compression 'lz4' requires the lz4 package")
+
+        self.fmt = fmt
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self._zstd_compressor = zstandard.ZstdCompressor() if compression == "zstd" else None
+
+    def dumps(self, item: Any) -> bytes:
+        body = _encode(self.fmt, item)
+
+        compression = self.compression
+        if compression != "none" and len(body) >= self.compress_threshold:
+            body = self._compress(body)
+        else:
+            compression = "none"
+
+        if self.fmt == "json" and compression == "none":
+            return body
+        return bytes((MAGIC, VERSION, FORMATS[self.fmt], COMPRESSIONS[compression])) + body
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decode a payload. Any failure, including errors raised by the
+        decompression and decoding libraries, is raised as a
+        DeserializationError.
+        """
+        try:
+            return self._loads(data)
+        except DeserializationError:
+            raise
+        except Exception as e:
+            raise DeserializationError(f"Undecodable queue payload: {e}") from e
+
+    def _loads(self, data: bytes) -> Any:
+        if isinstance(data, str):
+            data = data.encode()
+        if not data or data[0] != MAGIC:
+            return _decode("json", data)
+        if len(data) < 4:
+            raise DeserializationError("Truncated queue payload header")
+
+        version, fmt_id, compression_id = data[1], data[2], data[3]
+        if version != VERSION:
+            raise DeserializationError(f"Unsupported queue payload version: {version}")
+
+        body = _decompress(compression_id, data[4:])
+        return _decode(_name(FORMATS, fmt_id), body)
+
+    def _compress(self, body: bytes) -> bytes:
+        if self.compression == "zstd":
+            return self._zstd_compressor.compress(body)
+        return lz4_frame.compress(body)
+
+
+def _encode(fmt: str, item: Any) -> bytes:
+    if fmt == "msgpack":
+        return msgpack.packb(item, default=_msgpack_default, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(item)
+    return json.dumps(item, cls=CustomJSONEncoder).encode()
+
+
+def _decode(fmt: str, body: bytes) -> Any:
+    if fmt == "msgpack":
+        if msgpack is None:
+            raise ValueError("Received a msgpack payload but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _decompress(compression_id: int, body: bytes) -> bytes:
+    compression = _name(COMPRESSIONS, compression_id)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("Received a zstd payload but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if compression == "lz4":
+        if lz4_frame is None:
+            raise ValueError("Received an lz4 payload but lz4 is not installed")
+        return lz4_frame.decompress(body)
+    return body
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+
+def _name(mapping: dict, value: int) -> str:
+    for name, id_ in mapping.items():
+        if id_ == value:
+            return name
+    raise ValueError(f"Unknown queue payload field value: {value}")
+
+
+def get_serializer(fmt: Optional[str] = None, compression: Optional[str] = None) -> Serializer:
+    """
+    Build the serializer configured by QUEUE_FORMAT / QUEUE_COMPRESSION.
+    """
+    return Serializer(
+        fmt=fmt or os.getenv("QUEUE_FORMAT", "json"),
+        compression=compression or os.getenv("QUEUE_COMPRESSION", "none"),
+        compress_threshold=int(os.getenv("QUEUE_COMPRESS_THRESHOLD", "1024")),
+    )
@@ -0,0 +1,40 @@
+import redis
+
+# List the processing daemon blocks on; any push wakes it up.
+PROCESSING_TRIGGER_KEY = "processing:trigger"
+# Articles stored since the last trigger was sent.
+PROCESSING_BACKLOG_KEY = "processing:backlog"
+
+
+def record_backlog(client: redis.Redis, count: int, threshold: int) -> bool:
+    """
+    Add `count` newly stored items to the processing backlog and trigger a
+    processing run once it reaches `threshold`. Returns True if triggered.
+    """
+    if count <= 0 or threshold <= 0:
+        return False
+
+    backlog = client.incrby(PROCESSING_BACKLOG_KEY, count)
+    if backlog < threshold:
+        return False
+
+    # Concurrent workers may both see the threshold crossed; the extra
+    # trigger is harmless because the daemon coalesces them.
+    client.decrby(PROCESSING_BACKLOG_KEY, backlog)
+    trigger_processing(client)
+    return True
+
+
+def trigger_processing(client: redis.Redis) -> None:
+    client.rpush(PROCESSING_TRIGGER_KEY, 1)
+
+
+def wait_for_trigger(client: redis.Redis, timeout: float) -> bool:
+    """
+    Block up to `timeout` seconds for a trigger. Triggers that piled up
+    while a run was in progress are coalesced into one.
+    """
+    triggered = client.blpop(PROCESSING_TRIGGER_KEY, timeout=max(timeout, 0.01)) is not None
+    if triggered:
+        client.delete(PROCESSING_TRIGGER_KEY)
+    return triggered
@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import redis
+
+from .sources import DEDUP
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "mc_cid", "mc_eid", "cmpid", "ocid", "ref"}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonicalize an article URL so trivially different links compare equal.
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    query parameters and trailing slashes, and sorts the remaining query.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class UrlDedupFilter:
+    """
+    Drops articles whose URL was already queued recently.
+
+    URL hashes live in Redis sets sharded by hash prefix and bucketed by
+    day. Each bucket expires on its own, so membership effectively lasts
+    `ttl_days` without ever having to scan or prune a large set.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        prefix: str = "ingestion:dedup",
+        shards: int = DEDUP["shards"],
+        ttl_days: int = DEDUP["ttl_days"],
+    ):
+        self.redis = client
+        self.prefix = prefix
+        self.shards = shards
+        self.ttl_days = ttl_days
+        self.hits = 0
+        self.misses = 0
+
+    def _hash(self, url: str) -> str:
+        return hashlib.sha1(normalize_url(url).encode()).hexdigest()[:20]
+
+    def _article_hash(self, article: Dict) -> str:
+        url = article.get("url")
+        return self._hash(url) if url else ""
+
+    def _shard(self, url_hash: str) -> int:
+        return int(url_hash[:8], 16) % self.shards
+
+    def _key(self, day: int, shard: int) -> str:
+        return f"{self.prefix}:{day}:{shard}"
+
+    def filter_new(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Return the articles whose URLs have not been seen, dropping repeats
+        within `articles` too. Nothing is marked seen until `mark_seen`, so
+        callers can do that once the articles are safely queued.
+        """
+        today = int(time.time() // 86400)
+        days = range(today - self.ttl_days + 1, today + 1)
+
+        by_shard: Dict[int, List[str]] = defaultdict(list)
+        hashes: List[str] = []
+        for article in articles:
+            url_hash = self._article_hash(article)
+            hashes.append(url_hash)
+            if url_hash:
+                by_shard[self._shard(url_hash)].append(url_hash)
+
+        pipe = self.redis.pipeline(transaction=False)
+        lookups = []
+        for shard, shard_hashes in by_shard.items():
+            for day in days:
+                pipe.smismember(self._key(day, shard), shard_hashes)
+                lookups.append(shard_hashes)
+        seen = set()
+        for shard_hashes, flags in zip(lookups, pipe.execute()):
+            seen.update(h for h, flag in zip(shard_hashes, flags) if flag)
+
+        fresh: List[Dict] = []
+        for article, url_hash in zip(articles, hashes):
+            if url_hash and url_hash in seen:
+                continue
+            fresh.append(article)
+            if url_hash:
+                seen.add(url_hash)
+
+        hits = len(articles) - len(fresh)
+        self.hits += hits
+        self.misses += len(fresh)
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hincrby(f"{self.prefix}:stats", "hits", hits)
+        pipe.hincrby(f"{self.prefix}:stats", "misses", len(fresh))
+        pipe.execute()
+
+        return fresh
+
+    def mark_seen(self, articles: List[Dict]) -> None:
+        """
+        Record the articles' URLs in today's bucket.
+        """
+        today = int(time.time() // 86400)
+        by_shard: Dict[int, List[str]] = defaultdict(list)
+        for article in articles:
+            url_hash = self._article_hash(article)
+            if url_hash:
+                by_shard[self._shard(url_hash)].append(url_hash)
+        if not by_shard:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        ttl_seconds = self.ttl_days * 86400
+        for shard, shard_hashes in by_shard.items():
+            key = self._key(today, shard)
+            pipe.sadd(key, *shard_hashes)
+            pipe.expire(key, ttl_seconds)
+        pipe.execute()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Hit/miss counters for this process and across all ingestion runs.
+        """
+        raw = self.redis.hgetall(f"{self.prefix}:stats")
+        total_hits = int(raw.get(b"hits", 0))
+        total_misses = int(raw.get(b"misses", 0))
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": _rate(self.hits, self.misses),
+            "total_hits": total_hits,
+            "total_misses": total_misses,
+            "total_hit_rate": _rate(total_hits, total_misses),
+        }
+
+
+def _rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
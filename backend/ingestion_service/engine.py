@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .base import BaseIngestionSource
+from .sources import INGESTION
+from .watermark import WatermarkStore
+
+logger = logging.getLogger(__name__)
+
+# (source, articles, error) for every source that was run.
+SourceResult = Tuple[BaseIngestionSource, List[Dict], Optional[BaseException]]
+
+
+def create_client() -> httpx.AsyncClient:
+    """
+    Create the pooled HTTP client shared by every source in a run.
+    """
+    limits = httpx.Limits(
+        max_connections=INGESTION["max_connections"],
+        max_keepalive_connections=INGESTION["max_keepalive_connections"],
+    )
+    return httpx.AsyncClient(limits=limits, timeout=INGESTION["timeout"])
+
+
+class IngestionEngine:
+    """
+    Runs all ingestion sources concurrently over a single pooled client.
+
+    A failing source never aborts the others; its exception is returned in
+    the result tuple so the caller can decide how to report it.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[BaseIngestionSource],
+        watermarks: Optional[WatermarkStore] = None,
+    ):
+        self.sources = list(sources)
+        self.watermarks = watermarks
+
+    async def run(self) -> List[SourceResult]:
+        async with create_client() as client:
+            return await asyncio.gather(
+                *(self._run_source(client, source) for source in self.sources)
+            )
+
+    async def _run_source(
+        self, client: httpx.AsyncClient, source: BaseIngestionSource
+    ) -> SourceResult:
+        logger.info("Running source: %s", source.source_name)
+        try:
+            if self.watermarks is not None:
+                source.watermark = await asyncio.to_thread(
+                    self.watermarks.load, source.source_name
+                )
+            articles = await source.fetch_articles_async(client)
+        except Exception as e:
+            return source, [], e
+        return source, articles, None
+
+
+def run_sources(
+    sources: Sequence[BaseIngestionSource],
+    watermarks: Optional[WatermarkStore] = None,
+) -> List[SourceResult]:
+    """
+    Blocking entrypoint for running the engine from synchronous code.
+    """
+    return asyncio.run(IngestionEngine(sources, watermarks).run())
@@ -1,10 +1,12 @@
+import asyncio
 import logging
-import requests
-from typing import List, Dict
+import math
+import httpx
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-import time
 
 from .base import BaseIngestionSource
+from .engine import create_client
 from .sources import NEWSAPI
 
 logger = logging.getLogger(__name__)
@@ -17,52 +19,163 @@ class NewsAPIIngestionSource(BaseIngestionSource):
 
     def __init__(self):
         super().__init__(source_name="newsapi")
+        self.max_concurrency = NEWSAPI["concurrency"]
+        self.rate_per_second = NEWSAPI["rate_per_second"]
+        self.burst = NEWSAPI["burst"]
 
     def fetch_articles(self) -> List[Dict]:
-        articles: List[Dict] = []
-        page = 1
-
-        while page <= NEWSAPI["max_pages"]:
-            logger.info("newsapi: fetching page %d", page)
-            page_articles = self._fetch_page(page)
-            articles.extend(page_articles)
-            page += 1
+        async def _run() -> List[Dict]:
+            async with create_client() as client:
+                return await self.fetch_articles_async(client)
+
+        return asyncio.run(_run())
+
+    async def fetch_articles_async(self, client: httpx.AsyncClient) -> List[Dict]:
+        # A watermark recorded for a different query says nothing about
+        # what this query has already returned.
+        if self.watermark.get("query") != NEWSAPI["query"]:
+            self.watermark = {}
+        since = self._since()
+        # A previous run hit max_pages before reaching `since`; fetch the
+        # unfetched gap below the oldest article it got before anything newer.
+        until = self._parse_time(self.watermark.get("gap_before"))
+        self.next_watermark = dict(self.watermark, query=NEWSAPI["query"])
+
+        # The first page tells us how many results exist, so we never
+        # request pages beyond the end of the result set. It is also the
+        # only page sent with conditional-request validators, which only
+        # describe the unbounded query.
+        logger.info("newsapi: fetching page 1 (since %s%s)", since, f", until {until}" if until else "")
+        response = await self._request_page(client, 1, since, until, conditional=until is None)
+        if response.status_code == 304:
+            logger.info("newsapi: not modified since last run")
+            return []
+        response.raise_for_status()
+
+        if until is None:
+            self.next_watermark["etag"] = response.headers.get("ETag")
+            self.next_watermark["last_modified"] = response.headers.get("Last-Modified")
+
+        articles, total_results = self._parse_page(response)
+        new_articles, reached_seen = self._split_seen(articles, since)
+
+        available_pages = math.ceil(total_results / NEWSAPI["page_size"])
+        last_page = min(NEWSAPI["max_pages"], available_pages)
+
+        # Results are sorted newest first, so once already-seen items show up
+        # there is nothing new on later pages.
+        if last_page > 1 and not reached_seen:
+            logger.info("newsapi: fetching pages 2-%d concurrently", last_page)
+            pages = await asyncio.gather(
+                *(self._fetch_page(client, page, since, until) for page in range(2, last_page + 1))
+            )
+            for page_articles in pages:
+                page_new, page_reached_seen = self._split_seen(page_articles, since)
+                new_articles.extend(page_new)
+                reached_seen = reached_seen or page_reached_seen
+
+        # Unfetched pages past max_pages may still hold unseen articles.
+        truncated = available_pages > last_page and not reached_seen and since is not None
+        self._advance_watermark(new_articles, truncated)
+        logger.info("newsapi: fetched %d new articles total", len(new_articles))
+        return new_articles
+
+    def _since(self) -> Optional[datetime]:
+        return self._parse_time(self.watermark.get("published_at"))
+
+    @staticmethod
+    def _parse_time(value: Optional[str]) -> Optional[datetime]:
+        return datetime.fromisoformat(value) if value else None
+
+    def _split_seen(
+        self, articles: List[Dict], since: Optional[datetime]
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Drop articles older than the watermark and report whether any
+        already-seen article was on the page. Articles published exactly at
+        the watermark are kept; the URL dedup stage drops the repeat.
+        """
+        if since is None:
+            return articles, False
+
+        new_articles = [
+            a for a in articles
+            if a["published_at"] is None or a["published_at"] >= since
+        ]
+        reached_seen = any(
+            a["published_at"] is not None and a["published_at"] <= since
+            for a in articles
+        )
+        return new_articles, reached_seen
+
+    def _advance_watermark(self, articles: List[Dict], truncated: bool = False) -> None:
+        """
+        `published_at` only advances once everything below it was fetched.
 
-        logger.info("newsapi: fetched %d articles total", len(articles))
+        When pages were truncated, the articles between the old watermark
+        and the oldest one fetched are still missing, so the watermark stays
+        put and `gap_before` records where the next run has to resume;
+        `head` keeps the newest article seen meanwhile.
+        """
+        timestamps = [a["published_at"] for a in articles if a["published_at"] is not None]
+        head = self._parse_time(self.watermark.get("head"))
+        newest = max(timestamps + ([head] if head else []), default=None)
+
+        if truncated and timestamps:
+            self.next_watermark["gap_before"] = min(timestamps).isoformat()
+            self.next_watermark["head"] = newest.isoformat()
+            logger.warning("newsapi: hit max_pages before the watermark; resuming below %s next run", min(timestamps))
+            return
+
+        # Gap (if any) closed: drop the resume markers.
+        self.next_watermark["gap_before"] = None
+        self.next_watermark["head"] = None
+        since = self._since()
+        if newest is not None and (since is None or newest > since):
+            self.next_watermark["published_at"] = newest.isoformat()
+
+    async def _fetch_page(
+        self, client: httpx.AsyncClient, page: int, since: Optional[datetime], until: Optional[datetime] = None
+    ) -> List[Dict]:
+        response = await self._request_page(client, page, since, until)
+        response.raise_for_status()
+        articles, _ = self._parse_page(response)
         return articles
 
-    def _fetch_page(self, page: int) -> List[Dict]:
+    async def _request_page(
+        self,
+        client: httpx.AsyncClient,
+        page: int,
+        since: Optional[datetime],
+        until: Optional[datetime] = None,
+        conditional: bool = False,
+    ) -> httpx.Response:
         params = {
             "q": NEWSAPI["query"],
             "pageSize": NEWSAPI["page_size"],
             "page": page,
             "apiKey": NEWSAPI["api_key"],
             "language": "en",
+            "sortBy": "publishedAt",
         }
+        if since is not None:
+            params["from"] = since.isoformat()
+        if until is not None:
+            params["to"] = until.isoformat()
 
-        try:
-            response = requests.get(
-                NEWSAPI["endpoint"],
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-
-        except requests.exceptions.HTTPError as exc:
-            resp = exc.response
-
-            if resp is not None and resp.status_code == 429:
-                logger.warning("newsapi: rate limit hit, sleeping 60s")
-                time.sleep(60)
-                return self._fetch_page(page)
-
-            raise
+        headers = {}
+        if conditional:
+            if self.watermark.get("etag"):
+                headers["If-None-Match"] = self.watermark["etag"]
+            if self.watermark.get("last_modified"):
+                headers["If-Modified-Since"] = self.watermark["last_modified"]
 
-        except requests.exceptions.RequestException:
-            raise
+        return await self._get(client, NEWSAPI["endpoint"], params=params, headers=headers)
 
+    def _parse_page(self, response: httpx.Response) -> Tuple[List[Dict], int]:
         data = response.json()
-        return [self._normalize(a) for a in data.get("articles", [])]
+        articles = [self._normalize(a) for a in data.get("articles", [])]
+        return articles, int(data.get("totalResults", 0))
 
     def _normalize(self, article: Dict) -> Dict:
         """
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+from .sources import RATE_LIMIT
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: throttling and transient upstream failures.
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Async token bucket shared by every request a single source issues.
+
+    The bucket refills at `rate` tokens per second up to `capacity`. When the
+    upstream tells us to back off, the bucket is paused, which holds back
+    every pending request of that source without blocking other sources.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            elapsed = now - self.updated_at
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+
+            if self.rate <= 0:
+                return
+
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause_for(self, seconds: float) -> None:
+        """
+        Hold back all requests on this bucket for at least `seconds`.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """
+        Adapt to `X-RateLimit-*` headers returned by the upstream.
+        """
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        if remaining is None:
+            return
+
+        self.tokens = min(self.tokens, remaining)
+        if remaining < 1:
+            reset = _parse_reset(headers.get("X-RateLimit-Reset"))
+            if reset is not None:
+                self.pause_for(reset)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_bucket(source_name: str, rate: float, capacity: float) -> TokenBucket:
+    """
+    Return the process-wide bucket for a source, creating it on first use.
+    """
+    bucket = _buckets.get(source_name)
+    if bucket is None:
+        bucket = _buckets[source_name] = TokenBucket(rate, capacity)
+    return bucket
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Exponential backoff with full jitter for the given (zero-based) attempt.
+    """
+    ceiling = min(RATE_LIMIT["backoff_cap"], RATE_LIMIT["backoff_base"] * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Parse a `Retry-After` header given either as seconds or as an HTTP date.
+    """
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    seconds = _parse_float(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    # Providers disagree on whether the reset is an epoch timestamp or a
+    # number of seconds; anything that looks like an epoch is treated as one.
+    reset = _parse_float(value)
+    if reset is None:
+        return None
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -1,7 +1,12 @@
 import logging
 import os
+import time
 
+from .dedup import UrlDedupFilter
+from .engine import run_sources
 from .newsapi import NewsAPIIngestionSource
+from .sources import DEDUP, INGESTION
+from .watermark import WatermarkStore
 from common.queue import ARTICLE_QUEUE
 
 logging.basicConfig(
@@ -28,33 +33,66 @@ def get_enabled_sources():
     return sources
 
 
+def wait_for_queue_capacity():
+    """
+    Hold off queueing while synthesis is behind, up to a bounded wait.
+    """
+    max_depth = INGESTION["max_queue_depth"]
+    if max_depth <= 0:
+        return
+
+    deadline = time.monotonic() + INGESTION["backpressure_max_wait"]
+    depth = ARTICLE_QUEUE.qsize()
+    while depth > max_depth and time.monotonic() < deadline:
+        logger.info("Article queue depth %d exceeds %d, waiting...", depth, max_depth)
+        time.sleep(5)
+        depth = ARTICLE_QUEUE.qsize()
+
+
 def main():
     logger.info("Starting ingestion pipeline")
 
     total_articles_fetched = 0
+    watermarks = WatermarkStore(ARTICLE_QUEUE.redis)
+    dedup = UrlDedupFilter(ARTICLE_QUEUE.redis) if DEDUP["enabled"] else None
+
+    for source, articles, error in run_sources(get_enabled_sources(), watermarks):
+        if error is not None:
+            logger.error(
+                "Error processing source: %s. Skipping.",
+                source.source_name,
+                exc_info=error,
+            )
+            continue
+
+        fetched = len(articles)
+        if dedup is not None:
+            articles = dedup.filter_new(articles)
+
+        wait_for_queue_capacity()
+        ARTICLE_QUEUE.put_many(articles)
+        # Mark URLs only once queued, so a failed push is retried next run.
+        if dedup is not None:
+            dedup.mark_seen(articles)
+        total_articles_fetched += len(articles)
+        # Only advance the watermark once everything up to it is queued.
+        watermarks.save(source.source_name, source.next_watermark)
+        logger.info(
+            "%s: fetched %d articles, pushed %d new to queue",
+            source.source_name,
+            fetched,
+            len(articles),
+        )
 
-    try:
-        for source in get_enabled_sources():
-            logger.info("Running source: %s", source.source_name)
-            try:
-                articles = source.fetch_articles()
-                for article in articles:
-                    ARTICLE_QUEUE.put(article)
-                total_articles_fetched += len(articles)
-                logger.info(
-                    "%s: fetched %d articles and pushed to queue",
-                    source.source_name,
-                    len(articles),
-                )
-            except Exception as e:
-                logger.error(
-                    "Error processing source: %s. Skipping.",
-                    source.source_name,
-                    exc_info=e,
-                )
-
-    finally:
-        pass # No database connection to close here
+    if dedup is not None:
+        stats = dedup.stats()
+        logger.info(
+            "URL dedup: %d hits, %d misses (hit rate %.1f%%, all-time %.1f%%)",
+            stats["hits"],
+            stats["misses"],
+            stats["hit_rate"] * 100,
+            stats["total_hit_rate"] * 100,
+        )
 
     logger.info("Ingestion complete: %d articles fetched and queued", total_articles_fetched)
 
@@ -6,4 +6,28 @@ NEWSAPI = {
     "query": os.getenv("NEWSAPI_QUERY", "technology OR politics OR economy"),
     "page_size": int(os.getenv("NEWSAPI_PAGE_SIZE", "20")),
     "max_pages": int(os.getenv("NEWSAPI_MAX_PAGES", "2")),
+    "concurrency": int(os.getenv("NEWSAPI_CONCURRENCY", "4")),
+    "rate_per_second": float(os.getenv("NEWSAPI_RATE_PER_SECOND", "5")),
+    "burst": float(os.getenv("NEWSAPI_BURST", "5")),
+}
+
+INGESTION = {
+    "max_connections": int(os.getenv("INGESTION_MAX_CONNECTIONS", "20")),
+    "max_keepalive_connections": int(os.getenv("INGESTION_MAX_KEEPALIVE", "10")),
+    "timeout": float(os.getenv("INGESTION_TIMEOUT", "10")),
+    # Pause queueing while the article queue is deeper than this (0 = never)
+    "max_queue_depth": int(os.getenv("INGESTION_MAX_QUEUE_DEPTH", "0")),
+    "backpressure_max_wait": float(os.getenv("INGESTION_BACKPRESSURE_MAX_WAIT", "300")),
+}
+
+RATE_LIMIT = {
+    "max_retries": int(os.getenv("INGESTION_MAX_RETRIES", "5")),
+    "backoff_base": float(os.getenv("INGESTION_BACKOFF_BASE", "1")),
+    "backoff_cap": float(os.getenv("INGESTION_BACKOFF_CAP", "60")),
+}
+
+DEDUP = {
+    "enabled": os.getenv("INGESTION_DEDUP_ENABLED", "true").lower() == "true",
+    "shards": int(os.getenv("INGESTION_DEDUP_SHARDS", "16")),
+    "ttl_days": int(os.getenv("INGESTION_DEDUP_TTL_DAYS", "7")),
 }
@@ -0,0 +1,47 @@
+import logging
+from typing import Dict, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class WatermarkStore:
+    """
+    Durable per-source high-water marks, stored as Redis hashes.
+
+    A watermark is a flat dict of strings. Sources decide which fields they
+    use; the common ones are:
+    - published_at: ISO timestamp of the newest article already ingested
+    - etag / last_modified: validators for conditional requests
+    - gap_before / head: resume point and newest article seen when a run
+      stopped at its page limit before reaching published_at
+    - cursor: opaque pagination cursor for cursor-based APIs
+    """
+
+    def __init__(self, client: redis.Redis, prefix: str = "ingestion:watermark"):
+        self.redis = client
+        self.prefix = prefix
+
+    def _key(self, source_name: str) -> str:
+        return f"{self.prefix}:{source_name}"
+
+    def load(self, source_name: str) -> Dict[str, str]:
+        raw = self.redis.hgetall(self._key(source_name))
+        return {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in raw.items()
+        }
+
+    def save(self, source_name: str, watermark: Dict[str, Optional[str]]) -> None:
+        """
+        Replace the stored watermark. Fields set to None, such as validators
+        the server stopped sending, are removed rather than kept.
+        """
+        fields = {k: v for k, v in watermark.items() if v is not None}
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(self._key(source_name))
+        if fields:
+            pipe.hset(self._key(source_name), mapping=fields)
+        pipe.execute()
+        logger.info("%s: watermark advanced to %s", source_name, fields.get("published_at"))
@@ -1,15 +1,31 @@
 import os
-from typing import List, cast
+from collections import defaultdict
+from typing import List, Optional, Sequence, Tuple, cast
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
-import hdbscan
 import numpy as np
+import redis
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, exists
-from backend.common.db.models import Fact, Alignment
+from sqlalchemy import create_engine, delete, exists, func, insert, select, true
+from backend.common.ann_index import FactIndex
+from backend.common.db.models import Fact, Alignment, ClusterCentroid
+from backend.common.events import publish_data_change
+from backend.common.queue import REDIS_HOST, REDIS_PORT
 
+from .embedding import EmbeddingEncoder
+from .embedding_cache import EmbeddingStore
+from .incremental import CentroidIndex, assign_incremental, fit_labels, normalize, remap_labels
+from .summary import refresh_cluster_summaries
 
-def cluster_facts():
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# "incremental" assigns new facts to existing clusters; "rebuild" reclusters
+# every fact from scratch while keeping cluster ids stable.
+CLUSTER_MODE = os.getenv("CLUSTER_MODE", "incremental")
+# Facts fetched, embedded and written per round-trip.
+CHUNK_SIZE = int(os.getenv("CLUSTER_CHUNK_SIZE", "5000"))
+
+
+def get_database_url():
     load_dotenv()
 
     DB_USER = os.getenv("DB_USER")
@@ -17,68 +33,208 @@ def cluster_facts():
     DB_HOST = os.getenv("DB_HOST", "db")
     DB_NAME = os.getenv("DB_NAME")
 
-    DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:5432/{DB_NAME}"
+    return f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:5432/{DB_NAME}"
+
 
-    engine = create_engine(DATABASE_URL)
+def cluster_facts(
+    mode: Optional[str] = None,
+    engine=None,
+    encoder: Optional[EmbeddingEncoder] = None,
+    redis_client: Optional[redis.Redis] = None,
+    fact_index: Optional[FactIndex] = None,
+    save_index: bool = True,
+) -> Optional[FactIndex]:
+    """
+    Run one clustering pass and return the updated fact index.
+
+    Long-running callers pass their own pooled `engine`, a warm
+    EmbeddingEncoder and a Redis client; one-shot runs create them here,
+    loading the model only if some embedding is not cached. They can also
+    keep the returned `fact_index` in memory, pass it back to the next run
+    and save it themselves (`save_index=False`) instead of reading and
+    rewriting the whole file every run.
+    """
+    mode = mode or CLUSTER_MODE
+    engine = engine or create_engine(get_database_url())
+    owns_encoder = encoder is None
+    encoder = encoder or EmbeddingEncoder(MODEL_NAME)
     Session = sessionmaker(bind=engine)
     session = Session()
 
     try:
-        facts_to_cluster = (
-            session.query(Fact)
-            .filter(
-                ~session.query(Alignment)
-                .filter(Alignment.fact_id == Fact.id)
-                .exists()
-            )
-            .all()
-        )   
-        
-        if not facts_to_cluster:
-            print("No new facts to cluster.")
-            return
-
-        if len(facts_to_cluster) == 1:
-            alignment = Alignment(
-                fact_id=facts_to_cluster[0].id,
-                cluster_id=-1
-            )
-            session.add(alignment)
-            session.commit()
-            return
-        
-        fact_texts: List[str] = [
-            cast(str, fact.text) for fact in facts_to_cluster
-        ]
-
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-
-        embeddings: np.ndarray = model.encode(
-            fact_texts,
-            convert_to_numpy=True
-        )
-
-        clusterer = hdbscan.HDBSCAN(
-            min_cluster_size=2,
-            gen_min_span_tree=True
-        )
-        cluster_labels = clusterer.fit_predict(embeddings)
-
-        for fact, cluster_id in zip(facts_to_cluster, cluster_labels):
-            session.add(
-                Alignment(
-                    fact_id=fact.id,
-                    cluster_id=int(cluster_id)
-                )
-            )
+        # Only texts that are not in the cache are encoded, and the model is
+        # only loaded if there is at least one of them.
+        store = EmbeddingStore(session, encoder.cache_key)
+
+        if mode != "rebuild" and encoder_changed(session, encoder.cache_key):
+            print(f"Clusters were built by another encoder, rebuilding them for {encoder.cache_key}.")
+            mode = "rebuild"
 
+        if mode == "rebuild":
+            embedded = rebuild_clusters(session, store, encoder)
+        else:
+            embedded = cluster_new_facts(session, store, encoder)
+
+        store.evict()
         session.commit()
 
+        if embedded is not None:
+            # The alignments are committed, so readers must hear about them
+            # even if the index update below fails.
+            try:
+                publish_data_change(redis_client or redis.Redis(host=REDIS_HOST, port=REDIS_PORT))
+            except redis.RedisError as e:
+                print(f"Could not publish data change: {e}")
+            try:
+                fact_index = update_fact_index(*embedded, encoder.cache_key, rebuild=mode == "rebuild", fact_index=fact_index)
+                if save_index:
+                    fact_index.save()
+            except Exception as e:
+                print(f"Could not update fact index: {e}")
+
     except Exception as e:
         session.rollback()
         raise e
     finally:
         session.close()
+        if owns_encoder:
+            encoder.close()
+    return fact_index
+
+
+def encoder_changed(session, cache_key: str) -> bool:
+    """
+    Whether the stored centroids come from a different encoder, e.g. after
+    switching to quantized weights. Vectors of different encoders are not
+    comparable, so every fact has to be reclustered.
+    """
+    stored = set(session.execute(select(ClusterCentroid.model_name).distinct()).scalars())
+    return bool(stored) and cache_key not in stored
+
+
+def load_embeddings(session, condition, store: EmbeddingStore, encoder: EmbeddingEncoder) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stream `(id, text)` of the facts matching `condition` with a server-side
+    cursor and embed them chunk by chunk into one preallocated float32 array.
+
+    Only ids and texts are fetched, so memory is bounded by the embedding
+    matrix rather than by ORM objects and their JSONB columns.
+    """
+    total = session.execute(select(func.count()).select_from(Fact).where(condition)).scalar()
+    fact_ids = np.empty(total, dtype=np.int64)
+    embeddings: Optional[np.ndarray] = None
+
+    result = session.execute(
+        select(Fact.id, Fact.text)
+        .where(condition)
+        .order_by(Fact.id)
+        .execution_options(stream_results=True, yield_per=CHUNK_SIZE)
+    )
+    offset = 0
+    for chunk in result.partitions(CHUNK_SIZE):
+        # Facts inserted after the count are left for the next run.
+        chunk = chunk[:total - offset]
+        if not chunk:
+            break
+        vectors = store.encode([cast(str, text) for _, text in chunk], encoder)
+        if embeddings is None:
+            embeddings = np.empty((total, vectors.shape[1]), dtype=np.float32)
+
+        end = offset + len(chunk)
+        fact_ids[offset:end] = [fact_id for fact_id, _ in chunk]
+        embeddings[offset:end] = vectors
+        offset = end
+    result.close()
+
+    if embeddings is None:
+        return fact_ids[:0], np.empty((0, 0), dtype=np.float32)
+    return fact_ids[:offset], embeddings[:offset]
+
+
+def write_alignments(session, fact_ids: Sequence[int], cluster_ids: Sequence[str]):
+    """
+    Insert alignments in executemany batches rather than one ORM object per fact.
+    """
+    rows = [
+        {"fact_id": int(fact_id), "cluster_id": cluster_id}
+        for fact_id, cluster_id in zip(fact_ids, cluster_ids)
+    ]
+    for start in range(0, len(rows), CHUNK_SIZE):
+        session.execute(insert(Alignment), rows[start:start + CHUNK_SIZE])
+
+
+def cluster_new_facts(session, store: EmbeddingStore, encoder: EmbeddingEncoder):
+    unaligned = ~exists().where(Alignment.fact_id == Fact.id)
+    fact_ids, embeddings = load_embeddings(session, unaligned, store, encoder)
+
+    if not len(fact_ids):
+        print("No new facts to cluster.")
+        return None
+
+    index = CentroidIndex(session, encoder.cache_key).load()
+    cluster_ids = assign_incremental(index, embeddings)
+    index.save()
+
+    write_alignments(session, fact_ids, cluster_ids)
+    refresh_cluster_summaries(session, cluster_ids)
+    return fact_ids.tolist(), embeddings
+
+
+def rebuild_clusters(session, store: EmbeddingStore, encoder: EmbeddingEncoder):
+    """
+    Recluster every fact and rewrite all alignments and centroids.
+
+    Rebuilt clusters inherit the ids of the old clusters they overlap most,
+    so ids referenced elsewhere stay meaningful across rebuilds.
+    """
+    fact_ids, embeddings = load_embeddings(session, true(), store, encoder)
+    if not len(fact_ids):
+        print("No facts to cluster.")
+        return None
+
+    fact_ids = fact_ids.tolist()
+    # Vectors cached before the encoder normalized its output may not be unit length.
+    embeddings = normalize(embeddings)
+    labels = fit_labels(embeddings)
+
+    previous = dict(session.execute(select(Alignment.fact_id, Alignment.cluster_id)).all())
+    index = CentroidIndex(session, encoder.cache_key)
+    cluster_ids = remap_labels(fact_ids, labels, previous, index)
+
+    members = defaultdict(list)
+    for i, cluster_id in enumerate(cluster_ids):
+        if cluster_id != "-1":
+            members[cluster_id].append(i)
+    for cluster_id, rows in members.items():
+        index.new_cluster(embeddings[rows], cluster_id)
+    index.save(replace=True)
+
+    session.execute(delete(Alignment))
+    write_alignments(session, fact_ids, cluster_ids)
+    refresh_cluster_summaries(session)
+    return fact_ids, embeddings
+
+
+def update_fact_index(
+    fact_ids: List[int],
+    embeddings: np.ndarray,
+    model_name: str,
+    rebuild: bool = False,
+    fact_index: Optional[FactIndex] = None,
+) -> FactIndex:
+    """
+    Add freshly embedded facts to the ANN index (replacing it entirely on a
+    rebuild) so other services can query neighbours once it is saved.
+    `model_name` is the encoder's `cache_key`; `fact_index` is an index
+    already in memory, otherwise the one on disk is loaded.
+    """
+    dim = embeddings.shape[1]
+    if rebuild:
+        fact_index = FactIndex().create(dim, model_name)
+    elif fact_index is None or fact_index.model_name != model_name or fact_index.index.dim != dim:
+        fact_index = FactIndex.open(dim, model_name)
+    fact_index.add(fact_ids, normalize(embeddings))
+    return fact_index
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+import logging
+import os
+import signal
+import time
+from typing import Optional
+
+import redis
+from sqlalchemy import create_engine
+
+from backend.common.ann_index import FactIndex
+from backend.common.queue import REDIS_HOST, REDIS_PORT
+from backend.common.triggers import wait_for_trigger
+
+from .cluster import MODEL_NAME, cluster_facts, get_database_url
+from .embedding import EmbeddingEncoder
+
+logger = logging.getLogger(__name__)
+
+# Run at least this often even without a trigger.
+PROCESSING_INTERVAL = float(os.getenv("PROCESSING_INTERVAL_SECONDS", "900"))
+# Full rebuild cadence (0 disables scheduled rebuilds).
+REBUILD_INTERVAL = float(os.getenv("PROCESSING_REBUILD_INTERVAL_HOURS", "24")) * 3600
+DB_POOL_SIZE = int(os.getenv("PROCESSING_DB_POOL_SIZE", "2"))
+# How often the in-memory fact index is written to disk when it changed.
+FACT_INDEX_SAVE_INTERVAL = float(os.getenv("PROCESSING_FACT_INDEX_SAVE_SECONDS", "300"))
+
+
+class ProcessingDaemon:
+    """
+    Long-running clustering service.
+
+    Loads the embedding model and opens a pooled engine once, then runs an
+    incremental clustering pass whenever the synthesis service signals a
+    backlog (see common.triggers) or PROCESSING_INTERVAL elapses, and a
+    full rebuild every REBUILD_INTERVAL.
+
+    The fact index stays in memory between runs and is saved at most every
+    FACT_INDEX_SAVE_INTERVAL, and at shutdown.
+    """
+
+    def __init__(self):
+        self.engine = create_engine(
+            get_database_url(),
+            pool_size=DB_POOL_SIZE,
+            pool_pre_ping=True,
+        )
+        self.redis = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
+        self.encoder = EmbeddingEncoder(MODEL_NAME)
+        self.fact_index: Optional[FactIndex] = None
+        self._index_saved_at = time.monotonic()
+        self._stopping = False
+
+    def stop(self, signum=None, frame=None):
+        logger.info("Shutdown requested, finishing current run...")
+        self._stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        # Touch the model so its weights are loaded before the first run.
+        self.encoder.model
+
+        next_run = time.monotonic()
+        next_rebuild = time.monotonic() + REBUILD_INTERVAL if REBUILD_INTERVAL > 0 else float("inf")
+        logger.info("Processing daemon started")
+
+        while not self._stopping:
+            self.save_fact_index()
+            now = time.monotonic()
+            if now < next_run:
+                # Wait in short slices so SIGTERM is honoured promptly.
+                try:
+                    triggered = wait_for_trigger(self.redis, min(next_run - now, 5))
+                except redis.RedisError as e:
+                    logger.warning("Trigger wait failed: %s", e)
+                    time.sleep(min(next_run - now, 5))
+                    triggered = False
+                if not triggered:
+                    continue
+                logger.info("Processing triggered by backlog")
+
+            mode = "rebuild" if time.monotonic() >= next_rebuild else "incremental"
+            self.run_once(mode)
+            if mode == "rebuild":
+                next_rebuild = time.monotonic() + REBUILD_INTERVAL
+            next_run = time.monotonic() + PROCESSING_INTERVAL
+
+        self.save_fact_index(force=True)
+        self.encoder.close()
+        self.engine.dispose()
+        logger.info("Processing daemon stopped")
+
+    def run_once(self, mode: str):
+        started = time.monotonic()
+        try:
+            self.fact_index = cluster_facts(
+                mode,
+                engine=self.engine,
+                encoder=self.encoder,
+                redis_client=self.redis,
+                fact_index=self.fact_index,
+                save_index=False,
+            )
+        except Exception:
+            logger.exception("Clustering run failed")
+            return
+        logger.info("Clustering run (%s) finished in %.1fs", mode, time.monotonic() - started)
+
+    def save_fact_index(self, force: bool = False):
+        if self.fact_index is None or not self.fact_index.dirty:
+            return
+        if not force and time.monotonic() - self._index_saved_at < FACT_INDEX_SAVE_INTERVAL:
+            return
+        try:
+            self.fact_index.save()
+        except OSError as e:
+            logger.warning("Could not save fact index: %s", e)
+        self._index_saved_at = time.monotonic()
@@ -0,0 +1,151 @@
+import logging
+import os
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING = {
+    "batch_size": int(os.getenv("EMBEDDING_BATCH_SIZE", "64")),
+    # "torch", "onnx", or "onnx-int8" (dynamically quantized ONNX weights)
+    "backend": os.getenv("EMBEDDING_BACKEND", "torch"),
+    # Quantized weights file in the model repo. The default is tuned for
+    # AVX512-VNNI and is slow without it; use onnx/model_quint8_avx2.onnx on
+    # older x86 hosts or onnx/model_qint8_arm64.onnx on ARM.
+    "onnx_int8_file": os.getenv("EMBEDDING_ONNX_INT8_FILE", "onnx/model_qint8_avx512_vnni.onnx"),
+    # CPU worker processes for large inputs (0 or 1 = encode in-process)
+    "workers": int(os.getenv("EMBEDDING_WORKERS", "0")),
+    # Intra-op threads for in-process encoding (0 = library default)
+    "threads": int(os.getenv("EMBEDDING_THREADS", "0")),
+    # Texts handed to a pool worker at a time
+    "chunk_size": int(os.getenv("EMBEDDING_CHUNK_SIZE", "1024")),
+}
+
+
+def _has_cpu_flag(flag: str) -> bool:
+    """
+    Whether /proc/cpuinfo lists `flag`; assumed true where it cannot be read.
+    """
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return flag in line.split(":", 1)[1].split()
+    except OSError:
+        pass
+    return True
+
+
+class EmbeddingEncoder:
+    """
+    Sentence embedding encoder tuned for many-core CPU hosts.
+
+    Output is always L2-normalized float32. Inputs are sorted by length
+    before batching, so each batch (and each chunk sent to a pool worker)
+    holds texts of similar length and wastes little work on padding; the
+    result is returned in the original order.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = EMBEDDING["batch_size"],
+        backend: str = EMBEDDING["backend"],
+        workers: int = EMBEDDING["workers"],
+        threads: int = EMBEDDING["threads"],
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.backend = backend
+        self.workers = workers
+        self.threads = threads
+        self._model: Optional[SentenceTransformer] = None
+        self._pool = None
+
+    @property
+    def cache_key(self) -> str:
+        """
+        Identifies the vectors this encoder produces. Quantized weights give
+        slightly different vectors, so they are cached separately.
+        """
+        return self.model_name if self.backend != "onnx-int8" else f"{self.model_name}@onnx-int8"
+
+    @property
+    def model(self) -> SentenceTransformer:
+        if self._model is None:
+            started = time.monotonic()
+            if self.threads > 0:
+                import torch
+
+                torch.set_num_threads(self.threads)
+
+            if self.backend == "onnx":
+                self._model = SentenceTransformer(self.model_name, device="cpu", backend="onnx")
+            elif self.backend == "onnx-int8":
+                if "avx512_vnni" in EMBEDDING["onnx_int8_file"] and not _has_cpu_flag("avx512_vnni"):
+                    logger.warning(
+                        "%s is tuned for AVX512-VNNI, which this CPU lacks; set EMBEDDING_ONNX_INT8_FILE "
+                        "to a variant for this host",
+                        EMBEDDING["onnx_int8_file"],
+                    )
+                self._model = SentenceTransformer(
+                    self.model_name,
+                    device="cpu",
+                    backend="onnx",
+                    model_kwargs={"file_name": EMBEDDING["onnx_int8_file"]},
+                )
+            else:
+                self._model = SentenceTransformer(self.model_name, device="cpu")
+            logger.info(
+                "Loaded %s (%s backend) in %.1fs",
+                self.model_name,
+                self.backend,
+                time.monotonic() - started,
+            )
+        return self._model
+
+    def _use_pool(self, count: int) -> bool:
+        # Worker start-up and IPC only pay off for inputs spanning several chunks.
+        return self.workers > 1 and count >= EMBEDDING["chunk_size"] * 2
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        started = time.monotonic()
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        sorted_texts = [texts[i] for i in order]
+
+        kwargs = dict(
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        if self._use_pool(len(texts)):
+            if self._pool is None:
+                self._pool = self.model.start_multi_process_pool(target_devices=["cpu"] * self.workers)
+            vectors = self.model.encode(
+                sorted_texts, pool=self._pool, chunk_size=EMBEDDING["chunk_size"], **kwargs
+            )
+        else:
+            vectors = self.model.encode(sorted_texts, **kwargs)
+
+        embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+        embeddings[order] = vectors
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            "Encoded %d texts in %.2fs (%.1f texts/s)",
+            len(texts),
+            elapsed,
+            len(texts) / elapsed if elapsed > 0 else float("inf"),
+        )
+        return embeddings
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
@@ -0,0 +1,142 @@
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from backend.common.db.models import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_TTL_DAYS = int(os.getenv("EMBEDDING_CACHE_TTL_DAYS", "30"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "2000000"))
+
+# Keeps IN (...) lists and multi-row INSERTs at a reasonable size.
+LOOKUP_CHUNK_SIZE = 1000
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Persistent embedding cache keyed by (model name, SHA-256 of the text).
+
+    Embeddings are stored as raw float32 bytes in the `embedding_cache`
+    table. Only texts missing from the cache are passed to the encoder, so
+    a lazily loaded encoder never loads its model when everything hits.
+    `model_name` should be the encoder's `cache_key`.
+    """
+
+    def __init__(self, session: Session, model_name: str):
+        self.session = session
+        self.model_name = model_name
+
+    def encode(self, texts: Sequence[str], encoder) -> np.ndarray:
+        hashes = [text_hash(text) for text in texts]
+        cached = self._lookup(set(hashes))
+
+        misses: Dict[str, str] = {}
+        for h, text in zip(hashes, texts):
+            if h not in cached and h not in misses:
+                misses[h] = text
+
+        logger.info(
+            "Embedding cache: %d hits, %d misses (%d texts)",
+            len(cached),
+            len(misses),
+            len(texts),
+        )
+
+        if misses:
+            vectors = np.asarray(encoder.encode(list(misses.values())), dtype=np.float32)
+            computed = dict(zip(misses.keys(), vectors))
+            self._store(computed)
+            cached.update(computed)
+
+        return np.stack([cached[h] for h in hashes]).astype(np.float32, copy=False)
+
+    def _lookup(self, hashes: set) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        hash_list = list(hashes)
+        for start in range(0, len(hash_list), LOOKUP_CHUNK_SIZE):
+            chunk = hash_list[start:start + LOOKUP_CHUNK_SIZE]
+            rows = self.session.execute(
+                select(EmbeddingCache.text_hash, EmbeddingCache.embedding).where(
+                    EmbeddingCache.model_name == self.model_name,
+                    EmbeddingCache.text_hash.in_(chunk),
+                )
+            ).all()
+            for h, blob in rows:
+                found[h] = np.frombuffer(blob, dtype=np.float32)
+
+            hit_hashes = [h for h, _ in rows]
+            if hit_hashes:
+                self.session.execute(
+                    update(EmbeddingCache)
+                    .where(
+                        EmbeddingCache.model_name == self.model_name,
+                        EmbeddingCache.text_hash.in_(hit_hashes),
+                    )
+                    .values(last_used_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+        return found
+
+    def _store(self, vectors: Dict[str, np.ndarray]) -> None:
+        items: List = list(vectors.items())
+        for start in range(0, len(items), LOOKUP_CHUNK_SIZE):
+            chunk = items[start:start + LOOKUP_CHUNK_SIZE]
+            self.session.execute(
+                insert(EmbeddingCache)
+                .values([
+                    {
+                        "model_name": self.model_name,
+                        "text_hash": h,
+                        "dim": int(vector.shape[0]),
+                        "embedding": vector.astype(np.float32).tobytes(),
+                    }
+                    for h, vector in chunk
+                ])
+                .on_conflict_do_nothing(index_elements=["model_name", "text_hash"])
+            )
+
+    def evict(
+        self,
+        ttl_days: int = EMBEDDING_CACHE_TTL_DAYS,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ) -> int:
+        """
+        Drop entries unused for `ttl_days`, then the least recently used
+        ones beyond `max_entries`. Returns the number of rows deleted.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=ttl_days)
+        deleted = self.session.execute(
+            delete(EmbeddingCache).where(EmbeddingCache.last_used_at < cutoff)
+        ).rowcount
+
+        # Delete exactly the overflow, oldest first. Entries written in one
+        # transaction share a last_used_at, so a timestamp cutoff would take
+        # every tie with it; text_hash breaks them.
+        overflow = self.session.execute(select(func.count()).select_from(EmbeddingCache)).scalar() - max_entries
+        if overflow > 0:
+            lru_tail = (
+                select(EmbeddingCache.model_name, EmbeddingCache.text_hash)
+                .order_by(EmbeddingCache.last_used_at, EmbeddingCache.text_hash)
+                .limit(overflow)
+            )
+            deleted += self.session.execute(
+                delete(EmbeddingCache).where(
+                    tuple_(EmbeddingCache.model_name, EmbeddingCache.text_hash).in_(lru_tail)
+                )
+            ).rowcount
+
+        if deleted:
+            logger.info("Embedding cache: evicted %d entries", deleted)
+        return deleted
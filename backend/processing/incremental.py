@@ -0,0 +1,219 @@
+import logging
+import os
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import hdbscan
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from backend.common.db.models import ClusterCentroid, cluster_id_seq
+
+logger = logging.getLogger(__name__)
+
+NOISE = "-1"
+
+# Minimum cosine similarity for a new fact to join an existing cluster.
+ASSIGN_THRESHOLD = float(os.getenv("CLUSTER_ASSIGN_THRESHOLD", "0.75"))
+# Minimum share of a rebuilt cluster's members that must come from an old
+# cluster for it to inherit that cluster's id.
+REMAP_MIN_OVERLAP = float(os.getenv("CLUSTER_REMAP_MIN_OVERLAP", "0.5"))
+MIN_CLUSTER_SIZE = int(os.getenv("CLUSTER_MIN_SIZE", "2"))
+
+
+def normalize(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def fit_labels(embeddings: np.ndarray) -> np.ndarray:
+    """
+    HDBSCAN labels for `embeddings`; everything is noise below two points.
+    """
+    if len(embeddings) < max(MIN_CLUSTER_SIZE, 2):
+        return np.full(len(embeddings), -1)
+    clusterer = hdbscan.HDBSCAN(min_cluster_size=MIN_CLUSTER_SIZE, gen_min_span_tree=True)
+    return clusterer.fit_predict(embeddings)
+
+
+class CentroidIndex:
+    """
+    Unit-length centroids of all clusters, persisted in `cluster_centroid`.
+
+    Centroids are running means of their members' normalized embeddings,
+    so assigning a batch of new facts costs one (batch x clusters) matrix
+    product and never revisits old facts.
+    """
+
+    def __init__(self, session: Session, model_name: str):
+        # `model_name` is the encoder's `cache_key`.
+        self.session = session
+        self.model_name = model_name
+        self.ids: List[str] = []
+        self.sizes: List[int] = []
+        self.sums: List[np.ndarray] = []
+        self._dirty: set = set()
+
+    def load(self) -> "CentroidIndex":
+        rows = self.session.execute(
+            select(ClusterCentroid.cluster_id, ClusterCentroid.centroid, ClusterCentroid.size)
+            .where(ClusterCentroid.model_name == self.model_name)
+        ).all()
+        for cluster_id, blob, size in rows:
+            self.ids.append(cluster_id)
+            self.sizes.append(size)
+            self.sums.append(np.frombuffer(blob, dtype=np.float32) * size)
+        return self
+
+    def _matrix(self) -> np.ndarray:
+        return normalize(np.stack(self.sums))
+
+    def assign(self, embeddings: np.ndarray, threshold: float = ASSIGN_THRESHOLD) -> List[Optional[str]]:
+        """
+        Nearest cluster id per (normalized) embedding, or None when no
+        centroid is similar enough.
+        """
+        if not self.ids:
+            return [None] * len(embeddings)
+        similarity = embeddings @ self._matrix().T
+        best = similarity.argmax(axis=1)
+        return [
+            self.ids[j] if similarity[i, j] >= threshold else None
+            for i, j in enumerate(best)
+        ]
+
+    def add_members(self, cluster_id: str, embeddings: np.ndarray) -> None:
+        idx = self.ids.index(cluster_id)
+        self.sums[idx] = self.sums[idx] + embeddings.sum(axis=0)
+        self.sizes[idx] += len(embeddings)
+        self._dirty.add(cluster_id)
+
+    def new_cluster(self, embeddings: np.ndarray, cluster_id: Optional[str] = None) -> str:
+        cluster_id = cluster_id or self.allocate_id()
+        self.ids.append(cluster_id)
+        self.sizes.append(len(embeddings))
+        self.sums.append(embeddings.sum(axis=0))
+        self._dirty.add(cluster_id)
+        return cluster_id
+
+    def allocate_id(self) -> str:
+        # A sequence rather than max(cluster_id), which would scan all of
+        # `alignment` on every run that creates a cluster.
+        return str(self.session.execute(select(cluster_id_seq.next_value())).scalar())
+
+    def save(self, replace: bool = False) -> None:
+        if replace:
+            # A rebuild realigns every fact, so centroids of any encoder are stale.
+            self.session.execute(delete(ClusterCentroid))
+        rows = [
+            {
+                "cluster_id": cluster_id,
+                "model_name": self.model_name,
+                "centroid": (self.sums[i] / self.sizes[i]).astype(np.float32).tobytes(),
+                "size": self.sizes[i],
+            }
+            for i, cluster_id in enumerate(self.ids)
+            if replace or cluster_id in self._dirty
+        ]
+        if rows:
+            stmt = insert(ClusterCentroid).values(rows)
+            self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[ClusterCentroid.cluster_id],
+                    set_={
+                        "centroid": stmt.excluded.centroid,
+                        "size": stmt.excluded.size,
+                        "model_name": stmt.excluded.model_name,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        self._dirty.clear()
+
+
+def assign_incremental(index: CentroidIndex, embeddings: np.ndarray) -> List[str]:
+    """
+    Cluster ids for a batch of new facts.
+
+    Facts close to an existing centroid join that cluster; the rest are
+    clustered among themselves and form new clusters or stay noise.
+    """
+    embeddings = normalize(embeddings)
+    labels: List[Optional[str]] = index.assign(embeddings)
+
+    members: Dict[str, List[int]] = defaultdict(list)
+    for i, label in enumerate(labels):
+        if label is not None:
+            members[label].append(i)
+    for cluster_id, rows in members.items():
+        index.add_members(cluster_id, embeddings[rows])
+
+    leftover = [i for i, label in enumerate(labels) if label is None]
+    local_labels = fit_labels(embeddings[leftover])
+    new_members: Dict[int, List[int]] = defaultdict(list)
+    for i, local in zip(leftover, local_labels):
+        if local < 0:
+            labels[i] = NOISE
+        else:
+            new_members[int(local)].append(i)
+    for rows in new_members.values():
+        cluster_id = index.new_cluster(embeddings[rows])
+        for i in rows:
+            labels[i] = cluster_id
+
+    logger.info(
+        "Incremental clustering: %d joined existing clusters, %d formed %d new clusters, %d noise",
+        len(embeddings) - len(leftover),
+        sum(len(rows) for rows in new_members.values()),
+        len(new_members),
+        sum(1 for label in labels if label == NOISE),
+    )
+    return labels
+
+
+def remap_labels(
+    fact_ids: Sequence[int],
+    labels: np.ndarray,
+    previous: Dict[int, str],
+    index: CentroidIndex,
+) -> List[str]:
+    """
+    Give the clusters of a full rebuild stable ids.
+
+    Each new cluster inherits the old id that most of its members had,
+    greedily by overlap and at most once per old id; clusters without a
+    sufficiently overlapping predecessor get fresh ids.
+    """
+    members: Dict[int, List[int]] = defaultdict(list)
+    for i, label in enumerate(labels):
+        if label >= 0:
+            members[int(label)].append(i)
+
+    candidates = []
+    for label, rows in members.items():
+        overlap = Counter(
+            previous[fact_ids[i]] for i in rows
+            if previous.get(fact_ids[i], NOISE) != NOISE
+        )
+        for old_id, count in overlap.items():
+            if count / len(rows) >= REMAP_MIN_OVERLAP:
+                candidates.append((count, label, old_id))
+
+    mapping: Dict[int, str] = {}
+    taken: set = set()
+    for _, label, old_id in sorted(candidates, reverse=True):
+        if label not in mapping and old_id not in taken:
+            mapping[label] = old_id
+            taken.add(old_id)
+    for label in members:
+        if label not in mapping:
+            mapping[label] = index.allocate_id()
+
+    logger.info(
+        "Rebuild: %d clusters, %d kept their previous id",
+        len(members),
+        len(taken),
+    )
+    return [mapping[int(label)] if label >= 0 else NOISE for label in labels]
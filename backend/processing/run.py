@@ -1,6 +1,26 @@
+import logging
+import os
+import sys
+
 from .cluster import cluster_facts
 
+# "once" runs a single clustering pass; "daemon" keeps the model loaded and
+# runs on a schedule or when triggered.
+PROCESSING_MODE = os.getenv("PROCESSING_MODE", "once")
+
 if __name__ == "__main__":
-    print("Starting fact clustering process...")
-    cluster_facts()
-    print("Fact clustering process finished.")
+    # Optional argument: "incremental" (default), "rebuild" or "daemon"
+    mode = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if mode == "daemon" or (mode is None and PROCESSING_MODE == "daemon"):
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        )
+        from .daemon import ProcessingDaemon
+
+        ProcessingDaemon().run()
+    else:
+        print("Starting fact clustering process...")
+        cluster_facts(mode)
+        print("Fact clustering process finished.")
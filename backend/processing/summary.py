@@ -0,0 +1,66 @@
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# One aggregate per cluster over alignment ⋈ fact ⋈ article. The
+# representative fact is the most confident one, earliest first.
+_AGGREGATE = """
+    SELECT
+        al.cluster_id,
+        (array_agg(f.id ORDER BY f.confidence DESC NULLS LAST, f.id))[1],
+        (array_agg(f.text ORDER BY f.confidence DESC NULLS LAST, f.id))[1],
+        count(*),
+        count(DISTINCT f.article_id),
+        min(a.published_at),
+        max(a.published_at),
+        now()
+    FROM alignment al
+    JOIN fact f ON f.id = al.fact_id
+    JOIN article a ON a.id = f.article_id
+    WHERE al.cluster_id <> '-1' {condition}
+    GROUP BY al.cluster_id
+"""
+
+_UPSERT = """
+    INSERT INTO cluster_summary (
+        cluster_id, representative_fact_id, representative_fact,
+        fact_count, article_count, first_seen, last_seen, updated_at
+    )
+    {aggregate}
+    ON CONFLICT (cluster_id) DO UPDATE SET
+        representative_fact_id = EXCLUDED.representative_fact_id,
+        representative_fact = EXCLUDED.representative_fact,
+        fact_count = EXCLUDED.fact_count,
+        article_count = EXCLUDED.article_count,
+        first_seen = EXCLUDED.first_seen,
+        last_seen = EXCLUDED.last_seen,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+def refresh_cluster_summaries(session: Session, cluster_ids: Optional[Iterable[str]] = None) -> None:
+    """
+    Recompute `cluster_summary` rows for the given clusters, or for every
+    cluster when `cluster_ids` is None (after a rebuild).
+
+    Incremental runs only touch the clusters that gained facts, so the cost
+    follows the size of the batch rather than of the whole alignment table.
+    """
+    if cluster_ids is None:
+        session.execute(text("DELETE FROM cluster_summary"))
+        session.execute(text(_UPSERT.format(aggregate=_AGGREGATE.format(condition=""))))
+        logger.info("Refreshed all cluster summaries")
+        return
+
+    ids = sorted(set(cluster_ids) - {"-1"})
+    if not ids:
+        return
+    session.execute(
+        text(_UPSERT.format(aggregate=_AGGREGATE.format(condition="AND al.cluster_id = ANY(:ids)"))),
+        {"ids": ids},
+    )
+    logger.info("Refreshed %d cluster summaries", len(ids))
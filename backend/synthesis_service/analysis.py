@@ -0,0 +1,28 @@
+from typing import Dict, List, Optional
+
+from .writer import parse_article
+
+
+def analyze_article(article_data: Dict) -> Optional[Dict]:
+    """
+    CPU stage of the synthesis pipeline: turn a queue message into the row
+    to persist, or None if the message can never be stored.
+
+    Kept free of I/O and shared state so it can run in a worker process.
+    """
+    row = parse_article(article_data)
+    if row is None:
+        return None
+
+    # Here you would add your synthesis logic:
+    # - Extract facts
+    # - Perform alignment and clustering
+    # - Generate neutral article
+    # - Analyze bias
+    # - Compute tone, flesch_kincaid_grade and summary
+
+    return row
+
+
+def analyze_batch(batch: List[Dict]) -> List[Optional[Dict]]:
+    return [analyze_article(article_data) for article_data in batch]
@@ -1,14 +1,13 @@
 import logging
 import time
 import os
-from datetime import datetime
 
 from common.queue import ARTICLE_QUEUE # Reusing the queue definition
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-# Assuming models are defined in backend/db/models.py
-from common.db.models import Article, Source, Base
+from .analysis import analyze_article
+from .supervisor import Supervisor
+from .writer import BatchWriter, store_batch
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,63 +19,55 @@ logger = logging.getLogger(__name__)
 # Database setup
 # This will be used by the synthesis service to store processed articles/facts
 DATABASE_URL = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASS')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+# A batch is written once it holds BATCH_SIZE articles or BATCH_MAX_WAIT_MS
+# have passed since its first article arrived, whichever comes first.
+BATCH_SIZE = int(os.getenv("SYNTHESIS_BATCH_SIZE", "100"))
+BATCH_MAX_WAIT_MS = int(os.getenv("SYNTHESIS_BATCH_MAX_WAIT_MS", "500"))
+
+# "single" runs consume_articles in one thread; "supervisor" runs the
+# process/thread pool Supervisor to use every core.
+SYNTHESIS_MODE = os.getenv("SYNTHESIS_MODE", "single")
+MAX_IN_FLIGHT = int(os.getenv("SYNTHESIS_MAX_IN_FLIGHT", "0"))
+
+
+def drain_batch():
+    """
+    Collect up to BATCH_SIZE (message_id, article) pairs from the queue.
+    """
+    batch = ARTICLE_QUEUE.receive(BATCH_SIZE, block=True, timeout=5)
+    deadline = time.monotonic() + BATCH_MAX_WAIT_MS / 1000
+
+    while batch and len(batch) < BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        more = ARTICLE_QUEUE.receive(BATCH_SIZE - len(batch), block=True, timeout=remaining)
+        if not more:
+            break
+        batch.extend(more)
+
+    return batch
 
 
 def consume_articles():
     logger.info("Synthesis service started. Listening for articles...")
+    writer = BatchWriter(engine)
+    writer.warm()
+
     while True:
-        # Blocking pop with a timeout
-        article_data = ARTICLE_QUEUE.get(block=True, timeout=5)
-        if article_data:
-            logger.info("Received article from queue: %s", article_data.get("title"))
-            # Here you would add your synthesis logic:
-            # - Extract facts
-            # - Perform alignment and clustering
-            # - Generate neutral article
-            # - Analyze bias
-            
-            db = SessionLocal()
-            try:
-                source_name = article_data.get("source_name", "Unknown Source")
-                source_url = "http://unknown.com" # NewsAPI does not provide source URL
-                
-                source_obj = db.query(Source).filter_by(name=source_name).first()
-                if not source_obj:
-                    source_obj = Source(name=source_name, url=source_url)
-                    db.add(source_obj)
-                    db.commit()
-                    db.refresh(source_obj)
-
-                # Check if article already exists by URL
-                existing_article = db.query(Article).filter_by(url=article_data["url"]).first()
-                if not existing_article:
-                    published_at_str = article_data.get("published_at")
-                    published_at = datetime.fromisoformat(published_at_str) if published_at_str else None
-                    new_article = Article(
-                        title=article_data["title"],
-                        body=article_data.get("body"),
-                        url=article_data["url"],
-                        published_at=published_at,
-                        source_id=source_obj.id
-                    )
-                    db.add(new_article)
-                    db.commit()
-                    db.refresh(new_article)
-                    logger.info("Stored article in DB: %s", new_article.title)
-                else:
-                    logger.info("Article already exists in DB (URL: %s), skipping storage.", article_data["url"])
-            except Exception as e:
-                db.rollback()
-                logger.error("Error storing article in DB: %s", e)
-            finally:
-                db.close()
-            
-        else:
+        batch = drain_batch()
+        if not batch:
             logger.debug("No articles in queue, waiting...")
-        time.sleep(1) # Prevent busy-waiting too much
+            continue
+
+        rows = [analyze_article(article_data) for _, article_data in batch]
+        store_batch(ARTICLE_QUEUE, writer, batch, rows)
 
 
 if __name__ == "__main__":
-    consume_articles()
+    if SYNTHESIS_MODE == "supervisor":
+        Supervisor(ARTICLE_QUEUE, engine, BATCH_SIZE, MAX_IN_FLIGHT).run()
+    else:
+        consume_articles()
@@ -0,0 +1,100 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from common.db.models import Source
+
+logger = logging.getLogger(__name__)
+
+SOURCE_CACHE_SIZE = int(os.getenv("SYNTHESIS_SOURCE_CACHE_SIZE", "10000"))
+SOURCE_CACHE_TTL = float(os.getenv("SYNTHESIS_SOURCE_CACHE_TTL", "3600"))
+
+
+class SourceCache:
+    """
+    In-process LRU cache mapping source names to `source.id`.
+
+    Source ids never change once assigned, so the TTL only bounds how long
+    an entry for a source that was deleted out-of-band can survive. The
+    cache is safe to share between writer threads.
+    """
+
+    def __init__(self, max_size: int = SOURCE_CACHE_SIZE, ttl: float = SOURCE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def warm(self, conn) -> int:
+        """
+        Preload up to `max_size` sources so the first batches hit the cache.
+        """
+        rows = conn.execute(select(Source.name, Source.id).limit(self.max_size)).all()
+        self.put_many(dict(rows))
+        logger.info("Source cache warmed with %d sources", len(rows))
+        return len(rows)
+
+    def put_many(self, ids: Dict[str, int]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for name, source_id in ids.items():
+                self._entries[name] = (source_id, expires_at)
+                self._entries.move_to_end(name)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_many(self, names: Iterable[str]) -> Tuple[Dict[str, int], Set[str]]:
+        """
+        Split `names` into cached ids and names that still need resolving.
+        """
+        now = time.monotonic()
+        found: Dict[str, int] = {}
+        missing: Set[str] = set()
+        with self._lock:
+            for name in names:
+                entry = self._entries.get(name)
+                if entry is None or entry[1] < now:
+                    self._entries.pop(name, None)
+                    missing.add(name)
+                else:
+                    self._entries.move_to_end(name)
+                    found[name] = entry[0]
+        return found, missing
+
+    def resolve(self, conn, names: Iterable[str], default_url: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Return ids for all `names`, creating missing sources race-safely.
+
+        Returns (ids, created). Sources created on `conn` are not cached
+        until the caller has committed, via put_many(created); caching them
+        earlier would poison the cache if the transaction rolled back.
+        """
+        ids, missing = self.get_many(names)
+        if not missing:
+            return ids, {}
+
+        # ON CONFLICT DO NOTHING RETURNING only returns the rows we inserted;
+        # names another worker created concurrently are looked up below.
+        created = dict(conn.execute(
+            insert(Source)
+            .values([{"name": name, "url": default_url} for name in sorted(missing)])
+            .on_conflict_do_nothing(index_elements=[Source.name])
+            .returning(Source.name, Source.id)
+        ).all())
+
+        existing: Dict[str, int] = {}
+        if len(created) < len(missing):
+            existing = dict(conn.execute(
+                select(Source.name, Source.id).where(Source.name.in_(missing - created.keys()))
+            ).all())
+            self.put_many(existing)
+
+        ids.update(existing)
+        ids.update(created)
+        return ids, created
@@ -0,0 +1,159 @@
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, List, Tuple
+
+from .analysis import analyze_batch
+from .writer import BatchWriter, store_batch
+
+logger = logging.getLogger(__name__)
+
+PROCESS_WORKERS = int(os.getenv("SYNTHESIS_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+DB_WORKERS = int(os.getenv("SYNTHESIS_DB_WORKERS", "4"))
+DRAIN_TIMEOUT = float(os.getenv("SYNTHESIS_DRAIN_TIMEOUT", "30"))
+
+
+def _init_worker():
+    # The supervisor owns shutdown; workers must not die on Ctrl-C mid-batch.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class Supervisor:
+    """
+    Runs the synthesis pipeline on all cores.
+
+    Batches pulled from the queue go through `analyze_batch` in a process
+    pool (CPU stages), then to a thread pool that writes them with a shared
+    BatchWriter (DB I/O), and are acknowledged once committed.
+
+    At most `max_in_flight` messages are held between the queue and the
+    database. When that bound is reached the supervisor stops pulling, so a
+    slow database leaves the backlog in Redis instead of in memory. On
+    SIGTERM/SIGINT it stops pulling and drains what is in flight.
+    """
+
+    def __init__(self, queue, engine, batch_size: int, max_in_flight: int = 0):
+        self.queue = queue
+        self.writer = BatchWriter(engine)
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight or batch_size * (PROCESS_WORKERS + DB_WORKERS)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._stopping = threading.Event()
+
+    def stop(self, signum=None, frame=None):
+        if not self._stopping.is_set():
+            logger.info("Shutdown requested, draining in-flight batches...")
+        self._stopping.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.writer.warm()
+
+        logger.info(
+            "Synthesis supervisor started: %d process workers, %d DB workers, %d max in flight",
+            PROCESS_WORKERS,
+            DB_WORKERS,
+            self.max_in_flight,
+        )
+        cpu_pool = self._new_cpu_pool()
+        io_pool = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="synthesis-db")
+        try:
+            while not self._stopping.is_set():
+                capacity = self._wait_for_capacity()
+                if capacity == 0:
+                    continue
+
+                batch = self.queue.receive(min(self.batch_size, capacity), block=True, timeout=1)
+                if not batch:
+                    continue
+
+                self._reserve(len(batch))
+                try:
+                    future = cpu_pool.submit(analyze_batch, [article_data for _, article_data in batch])
+                except BrokenProcessPool:
+                    # A worker died; the pool accepts no more work until replaced.
+                    logger.error("Process pool is broken, restarting it")
+                    self.queue.requeue(batch)
+                    self._release(len(batch))
+                    cpu_pool.shutdown(wait=False, cancel_futures=True)
+                    cpu_pool = self._new_cpu_pool()
+                    continue
+                future.add_done_callback(
+                    lambda f, batch=batch: self._on_analyzed(f, batch, io_pool)
+                )
+
+            self._drain()
+        finally:
+            cpu_pool.shutdown(wait=True, cancel_futures=True)
+            io_pool.shutdown(wait=True)
+            logger.info("Synthesis supervisor stopped")
+
+    def _new_cpu_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _wait_for_capacity(self) -> int:
+        with self._cond:
+            while self._in_flight >= self.max_in_flight and not self._stopping.is_set():
+                self._cond.wait(timeout=1)
+            if self._stopping.is_set():
+                return 0
+            return self.max_in_flight - self._in_flight
+
+    def _reserve(self, count: int):
+        with self._cond:
+            self._in_flight += count
+
+    def _release(self, count: int):
+        with self._cond:
+            self._in_flight -= count
+            self._cond.notify_all()
+
+    def _drain(self):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight == 0, timeout=DRAIN_TIMEOUT):
+                logger.warning(
+                    "Drain timed out with %d messages in flight; %s",
+                    self._in_flight,
+                    "they will be redelivered" if self.queue.REDELIVERS else "they are lost",
+                )
+
+    def _on_analyzed(self, future: Future, batch: List[Tuple[Any, dict]], io_pool: ThreadPoolExecutor):
+        try:
+            rows = future.result()
+        except BrokenProcessPool:
+            # The batch itself was fine; its worker died under it.
+            logger.error("Worker died analyzing a batch of %d articles; requeueing it", len(batch))
+            self.queue.requeue(batch)
+            self._release(len(batch))
+            return
+        except Exception as e:
+            logger.error("Analysis of batch of %d articles failed: %s", len(batch), e)
+            self._release(len(batch))
+            return
+
+        try:
+            io_pool.submit(self._write, batch, rows)
+        except RuntimeError:
+            # The pool is already shut down; hand the batch back unwritten.
+            self.queue.requeue(batch)
+            self._release(len(batch))
+
+    def _write(self, batch: List[Tuple[Any, dict]], rows: List[dict]):
+        try:
+            store_batch(self.queue, self.writer, batch, rows)
+        except Exception as e:
+            logger.error("Error settling batch of %d articles: %s", len(batch), e)
+        finally:
+            self._release(len(batch))
@@ -0,0 +1,195 @@
+import logging
+import os
+from datetime import datetime
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import InterfaceError, OperationalError, StatementError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+
+from common.db.models import Article, Source
+from common.events import publish_data_change
+from common.queue import ARTICLE_QUEUE
+from common.triggers import record_backlog
+
+from .source_cache import SourceCache
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_SOURCE_NAME = "Unknown Source"
+UNKNOWN_SOURCE_URL = "http://unknown.com"  # NewsAPI does not provide source URL
+
+# Wake the processing daemon after this many new articles (0 = never)
+PROCESSING_TRIGGER_THRESHOLD = int(os.getenv("PROCESSING_TRIGGER_THRESHOLD", "500"))
+
+
+def parse_article(article_data: Dict) -> Optional[Dict]:
+    """
+    Turn a queue message into an `article` row, or None if it can never be
+    stored (missing required fields or an unparseable date).
+    """
+    published_at_str = article_data.get("published_at")
+    if not article_data.get("url") or not article_data.get("title") or not published_at_str:
+        return None
+    try:
+        published_at = datetime.fromisoformat(published_at_str)
+    except (TypeError, ValueError):
+        return None
+
+    return {
+        "title": article_data["title"],
+        "body": article_data.get("body"),
+        "url": article_data["url"],
+        "published_at": published_at,
+        "source_name": article_data.get("source_name") or UNKNOWN_SOURCE_NAME,
+    }
+
+
+class BatchWriter:
+    """
+    Persists a batch of articles in a single transaction.
+
+    Articles are inserted with INSERT ... ON CONFLICT DO NOTHING, so the cost
+    per batch is a fixed handful of statements no matter how many articles
+    it holds, and duplicates are skipped by the database instead of being
+    looked up one by one. Source ids come from a SourceCache, so known
+    sources cost no query at all.
+    """
+
+    def __init__(self, engine: Engine, sources: Optional[SourceCache] = None):
+        self.engine = engine
+        self.sources = sources or SourceCache()
+
+    def _bump_article_counts(self, conn, per_source: Counter) -> None:
+        """
+        Keep `source.article_count` in step with the rows just inserted, in
+        the same transaction, updating sources in id order.
+        """
+        if not per_source:
+            return
+        conn.execute(
+            update(Source)
+            .where(Source.id == bindparam("source_id"))
+            .values(article_count=Source.article_count + bindparam("added")),
+            [
+                {"source_id": source_id, "added": added}
+                for source_id, added in sorted(per_source.items())
+            ],
+        )
+
+    def warm(self) -> None:
+        with self.engine.connect() as conn:
+            self.sources.warm(conn)
+
+    def write(self, rows: List[Dict]) -> Tuple[int, List[Dict]]:
+        """
+        Store parsed article rows. Returns how many were newly inserted and
+        the rows the database rejected.
+
+        If the batch insert fails on bad data, the batch is bisected until
+        the offending rows are isolated, so one bad row costs O(log n) extra
+        statements and the rest of the batch is still stored. Connection
+        errors are not row errors and are raised as is.
+        """
+        if not rows:
+            return 0, []
+
+        # Later duplicates within the batch would be no-ops anyway. Rows and
+        # sources are written in key order so that concurrent workers take
+        # row locks in the same order and cannot deadlock each other.
+        unique_rows = sorted({row["url"]: row for row in reversed(rows)}.values(), key=lambda row: row["url"])
+        inserted, rejected = self._write_bisecting(unique_rows)
+
+        try:
+            if inserted:
+                publish_data_change(ARTICLE_QUEUE.redis)
+            record_backlog(ARTICLE_QUEUE.redis, inserted, PROCESSING_TRIGGER_THRESHOLD)
+        except Exception as e:
+            logger.warning("Could not publish data change: %s", e)
+        return inserted, rejected
+
+    def _write_bisecting(self, rows: List[Dict]) -> Tuple[int, List[Dict]]:
+        try:
+            return self._insert(rows), []
+        except StatementError as e:
+            if isinstance(e, (OperationalError, InterfaceError)) or getattr(e, "connection_invalidated", False):
+                raise
+            if len(rows) == 1:
+                logger.error("Rejected article %s: %s", rows[0]["url"], getattr(e, "orig", None) or e)
+                return 0, rows
+
+        middle = len(rows) // 2
+        left_inserted, left_rejected = self._write_bisecting(rows[:middle])
+        right_inserted, right_rejected = self._write_bisecting(rows[middle:])
+        return left_inserted + right_inserted, left_rejected + right_rejected
+
+    def _insert(self, unique_rows: List[Dict]) -> int:
+        """
+        Insert rows in one transaction and return how many were new.
+        """
+        with self.engine.begin() as conn:
+            source_ids, created_sources = self.sources.resolve(
+                conn, {row["source_name"] for row in unique_rows}, UNKNOWN_SOURCE_URL
+            )
+            result = conn.execute(
+                insert(Article)
+                .values([
+                    {
+                        "title": row["title"],
+                        "body": row["body"],
+                        "url": row["url"],
+                        "published_at": row["published_at"],
+                        "source_id": source_ids[row["source_name"]],
+                    }
+                    for row in unique_rows
+                ])
+                .on_conflict_do_nothing(index_elements=[Article.url])
+                .returning(Article.source_id)
+            )
+            per_source = Counter(source_id for (source_id,) in result)
+            inserted = sum(per_source.values())
+            self._bump_article_counts(conn, per_source)
+
+        # Only cache sources once the transaction that created them committed.
+        self.sources.put_many(created_sources)
+        return inserted
+
+
+def store_batch(queue, writer: BatchWriter, batch: Sequence[Tuple[Any, Dict]], rows: Sequence[Optional[Dict]]) -> None:
+    """
+    Write the analyzed `rows` of a received `batch` and settle its messages.
+
+    Malformed articles are dropped and rows the database rejects are
+    dead-lettered; both are acknowledged with the rest. If the write fails
+    as a whole, the batch is handed back to the queue for another attempt.
+    """
+    valid_rows = []
+    for (_, article_data), row in zip(batch, rows):
+        if row is None:
+            logger.error("Dropping malformed article: %s", article_data.get("url"))
+        else:
+            valid_rows.append(row)
+
+    try:
+        inserted, rejected = writer.write(valid_rows)
+    except Exception as e:
+        logger.error("Error storing batch of %d articles in DB: %s", len(valid_rows), e)
+        queue.requeue(batch)
+        return
+
+    if rejected:
+        rejected_urls = {row["url"] for row in rejected}
+        queue.dead_letter([
+            (message_id, article_data)
+            for message_id, article_data in batch
+            if article_data.get("url") in rejected_urls
+        ])
+    queue.ack([message_id for message_id, _ in batch])
+    logger.info(
+        "Stored %d new articles (%d duplicates skipped, %d rejected)",
+        inserted,
+        len(valid_rows) - inserted - len(rejected),
+        len(rejected),
+    )
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("redis")
+
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from backend.api_service.cache import CachedResponse, ResponseCache, etag_matches
+from backend.common.events import DATA_VERSION_KEY
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ("", False),
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('"other", W/"abc"', True),
+        ("*", True),
+        ('"other"', False),
+    ],
+)
+def test_etag_matches(header, matches):
+    assert etag_matches(header, 'W/"abc"') is matches
+
+
+def test_cached_response_round_trip():
+    entry = CachedResponse(b'{"a": "line\\nbreak"}\n', "application/json", 'W/"abc"', 1234.5)
+    assert CachedResponse.loads(entry.dumps()) == entry
+
+
+class FakeRedis:
+    def __init__(self, version=1):
+        self.data = {DATA_VERSION_KEY: str(version).encode()}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+def request(path, query="", headers=None):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    })
+
+
+class Endpoint:
+    def __init__(self, status_code=200):
+        self.calls = 0
+        self.status_code = status_code
+
+    async def __call__(self, request):
+        self.calls += 1
+        return StreamingResponse(iter([b'{"items": []}']), status_code=self.status_code, media_type="application/json")
+
+
+async def get(cache, endpoint, path="/api/articles", query="", headers=None):
+    response = await cache(request(path, query, headers), endpoint)
+    return response, getattr(response, "body", b"")
+
+
+def test_miss_then_hit_then_not_modified():
+    cache = ResponseCache(FakeRedis(), max_entries=8, version_ttl=60)
+    endpoint = Endpoint()
+
+    async def scenario():
+        first, body = await get(cache, endpoint, query="b=2&a=1")
+        second, _ = await get(cache, endpoint, query="a=1&b=2")
+        third, third_body = await get(cache, endpoint, query="a=1&b=2", headers={"If-None-Match": first.headers["etag"]})
+        return first, body, second, third, third_body
+
+    first, body, second, third, third_body = asyncio.run(scenario())
+
+    assert first.headers["x-cache"] == "MISS"
+    assert body == b'{"items": []}'
+    assert second.headers["x-cache"] == "HIT"
+    assert second.headers["etag"] == first.headers["etag"]
+    assert third.status_code == 304
+    assert third_body == b""
+    assert endpoint.calls == 1
+
+
+def test_version_bump_invalidates():
+    client = FakeRedis(version=1)
+    cache = ResponseCache(client, max_entries=8, version_ttl=0)
+    endpoint = Endpoint()
+
+    async def scenario():
+        await get(cache, endpoint)
+        client.data[DATA_VERSION_KEY] = b"2"
+        response, _ = await get(cache, endpoint)
+        return response
+
+    assert asyncio.run(scenario()).headers["x-cache"] == "MISS"
+    assert endpoint.calls == 2
+
+
+def test_uncached_paths_and_errors_pass_through():
+    cache = ResponseCache(FakeRedis(), max_entries=8, version_ttl=60)
+    failing = Endpoint(status_code=500)
+
+    async def scenario():
+        other, _ = await get(cache, Endpoint(), path="/api/search")
+        await get(cache, failing)
+        error, _ = await get(cache, failing)
+        return other, error
+
+    other, error = asyncio.run(scenario())
+    assert "x-cache" not in other.headers
+    assert error.status_code == 500
+    assert failing.calls == 2
@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+import pytest
+
+pytest.importorskip("redis")
+
+from backend.ingestion_service.dedup import UrlDedupFilter, normalize_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://WWW.Example.com/News/", "https://example.com/News"),
+        ("https://example.com:443/a", "https://example.com/a"),
+        ("http://example.com:8080/a", "http://example.com:8080/a"),
+        ("https://example.com/a#comments", "https://example.com/a"),
+        ("https://example.com/a?utm_source=x&b=2&fbclid=y&a=1", "https://example.com/a?a=1&b=2"),
+        ("https://example.com", "https://example.com/"),
+        ("  https://example.com/a  ", "https://example.com/a"),
+    ],
+)
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_normalize_url_keeps_distinct_articles_apart():
+    assert normalize_url("https://example.com/a?id=1") != normalize_url("https://example.com/a?id=2")
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+    def execute(self):
+        results = []
+        for name, args in self.calls:
+            if name == "smismember":
+                key, members = args
+                results.append([int(m in self.redis.sets[key]) for m in members])
+            elif name == "sadd":
+                self.redis.sets[args[0]].update(args[1:])
+                results.append(len(args) - 1)
+            else:
+                results.append(None)
+        return results
+
+
+class FakeRedis:
+    def __init__(self):
+        self.sets = defaultdict(set)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def articles(*urls):
+    return [{"url": url} for url in urls]
+
+
+def test_filter_new_drops_repeats_but_marks_nothing():
+    dedup = UrlDedupFilter(FakeRedis(), shards=4, ttl_days=2)
+    batch = articles("https://example.com/a", "https://www.example.com/a/", "https://example.com/b")
+
+    assert dedup.filter_new(batch) == [batch[0], batch[2]]
+    # Not queued yet, so a retry must see the same articles again.
+    assert dedup.filter_new(batch) == [batch[0], batch[2]]
+
+
+def test_mark_seen_filters_later_batches():
+    dedup = UrlDedupFilter(FakeRedis(), shards=4, ttl_days=2)
+    dedup.mark_seen(articles("https://example.com/a"))
+
+    batch = articles("https://example.com/a?utm_medium=rss", "https://example.com/b", None)
+    assert dedup.filter_new(batch) == batch[1:]
+    assert (dedup.hits, dedup.misses) == (1, 2)
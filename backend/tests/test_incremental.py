@@ -0,0 +1,100 @@
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("hdbscan")
+pytest.importorskip("sqlalchemy")
+
+from backend.processing.incremental import NOISE, CentroidIndex, assign_incremental, remap_labels
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeSession:
+    """Stands in for the session; only serves cluster_id_seq."""
+
+    def __init__(self, start=100):
+        self.ids = itertools.count(start)
+
+    def execute(self, statement):
+        return FakeResult(next(self.ids))
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def index_with(**centroids):
+    index = CentroidIndex(FakeSession(), "test-model")
+    for cluster_id, centroid in centroids.items():
+        index.new_cluster(centroid[None, :], cluster_id)
+    return index
+
+
+def test_assign_joins_existing_clusters_and_updates_centroids():
+    index = index_with(c7=unit(1, 0, 0, 0))
+    embeddings = np.stack([unit(1, 0.05, 0, 0), unit(1, 0, 0.05, 0)])
+
+    assert assign_incremental(index, embeddings) == ["c7", "c7"]
+    assert index.sizes == [3]
+    assert index._dirty == {"c7"}
+
+
+def test_assign_forms_new_clusters_from_leftovers():
+    index = index_with(c7=unit(1, 0, 0, 0))
+    rng = np.random.default_rng(0)
+    group_a = np.tile([0, 1, 0, 0], (4, 1)) + rng.normal(0, 0.01, (4, 4))
+    group_b = np.tile([0, 0, 1, 0], (4, 1)) + rng.normal(0, 0.01, (4, 4))
+    embeddings = np.vstack([unit(1, 0.05, 0, 0)[None, :], group_a, group_b]).astype(np.float32)
+
+    labels = assign_incremental(index, embeddings)
+
+    assert labels[0] == "c7"
+    assert len(set(labels[1:5])) == len(set(labels[5:])) == 1
+    assert {labels[1], labels[5]} == {"100", "101"}
+    assert index.ids == ["c7", "100", "101"]
+
+
+def test_a_lone_leftover_is_noise():
+    index = index_with(c7=unit(1, 0, 0, 0))
+    assert assign_incremental(index, unit(0, 0, 0, 1)[None, :]) == [NOISE]
+    assert index.ids == ["c7"]
+
+
+def test_assign_without_clusters():
+    index = index_with()
+    assert index.assign(np.stack([unit(1, 0, 0, 0)])) == [None]
+
+
+def test_remap_keeps_ids_of_overlapping_clusters():
+    fact_ids = [1, 2, 3, 4, 5, 6]
+    previous = {1: "5", 2: "5", 3: "5", 4: "8", 5: "8", 6: NOISE}
+    labels = np.array([1, 1, 1, 0, 0, -1])
+
+    assert remap_labels(fact_ids, labels, previous, index_with()) == ["5", "5", "5", "8", "8", NOISE]
+
+
+def test_remap_gives_each_old_id_to_one_cluster():
+    # Both new clusters come mostly from "5"; the larger overlap keeps it.
+    fact_ids = [1, 2, 3, 4, 5]
+    previous = {1: "5", 2: "5", 3: "5", 4: "5", 5: "5"}
+    labels = np.array([0, 0, 0, 1, 1])
+
+    assert remap_labels(fact_ids, labels, previous, index_with()) == ["5", "5", "5", "100", "100"]
+
+
+def test_remap_allocates_ids_for_clusters_without_predecessor():
+    fact_ids = [1, 2, 3, 4]
+    previous = {1: NOISE, 3: "9"}
+    labels = np.array([0, 0, 1, 1])
+
+    # Half of cluster 1 came from "9", which meets the overlap threshold.
+    assert remap_labels(fact_ids, labels, previous, index_with()) == ["100", "100", "9", "9"]
@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from backend.ingestion_service import ratelimit
+from backend.ingestion_service.newsapi import NewsAPIIngestionSource
+from backend.ingestion_service.sources import NEWSAPI
+
+ENDPOINT = "https://newsapi.test/v2/everything"
+OLDEST = datetime(2026, 1, 1, 12, 0, 0)
+# Ten articles a minute apart, the oldest of which was ingested already.
+FEED = [
+    {
+        "title": f"Article {i}",
+        "content": "Body",
+        "url": f"https://news.example/{i}",
+        "publishedAt": (OLDEST + timedelta(minutes=i)).isoformat() + "Z",
+        "source": {"name": "Example"},
+    }
+    for i in reversed(range(10))
+]
+
+
+class FakeNewsAPI:
+    """Serves FEED newest first, honouring from/to and pagination."""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        params = request.url.params
+        since = datetime.fromisoformat(params["from"]) if "from" in params else None
+        until = datetime.fromisoformat(params["to"]) if "to" in params else None
+        matching = [
+            a for a in FEED
+            if (since is None or datetime.fromisoformat(a["publishedAt"][:-1]) >= since)
+            and (until is None or datetime.fromisoformat(a["publishedAt"][:-1]) <= until)
+        ]
+        size = int(params["pageSize"])
+        start = (int(params["page"]) - 1) * size
+        return httpx.Response(
+            200,
+            json={"status": "ok", "totalResults": len(matching), "articles": matching[start:start + size]},
+            headers={"ETag": '"feed"'},
+        )
+
+
+@pytest.fixture
+def newsapi(monkeypatch):
+    monkeypatch.setitem(NEWSAPI, "endpoint", ENDPOINT)
+    monkeypatch.setitem(NEWSAPI, "page_size", 2)
+    monkeypatch.setitem(NEWSAPI, "max_pages", 2)
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    return FakeNewsAPI()
+
+
+def fetch(server: FakeNewsAPI, watermark):
+    source = NewsAPIIngestionSource()
+    source.rate_per_second = 0
+    source.watermark = dict(watermark)
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            return await source.fetch_articles_async(client)
+
+    return asyncio.run(_run()), source.next_watermark
+
+
+def minute(i: int) -> str:
+    return (OLDEST + timedelta(minutes=i)).isoformat()
+
+
+def test_truncated_run_keeps_the_watermark_and_records_the_gap(newsapi):
+    watermark = {"query": NEWSAPI["query"], "published_at": minute(0), "etag": '"old"'}
+    articles, watermark = fetch(newsapi, watermark)
+
+    assert [a["title"] for a in articles] == ["Article 9", "Article 8", "Article 7", "Article 6"]
+    assert watermark["published_at"] == minute(0)
+    assert watermark["gap_before"] == minute(6)
+    assert watermark["head"] == minute(9)
+
+
+def test_gap_is_filled_before_the_watermark_advances(newsapi):
+    watermark = {"query": NEWSAPI["query"], "published_at": minute(0), "etag": '"old"'}
+    fetched = set()
+    for _ in range(3):
+        articles, watermark = fetch(newsapi, watermark)
+        fetched.update(a["title"] for a in articles)
+        watermark = {k: v for k, v in watermark.items() if v is not None}
+
+    assert fetched == {f"Article {i}" for i in range(10)}
+    assert watermark["published_at"] == minute(9)
+    assert "gap_before" not in watermark and "head" not in watermark
+
+
+def test_gap_requests_are_bounded_and_unconditional(newsapi):
+    watermark = {
+        "query": NEWSAPI["query"],
+        "published_at": minute(0),
+        "gap_before": minute(3),
+        "head": minute(9),
+        "etag": '"old"',
+    }
+    articles, next_watermark = fetch(newsapi, watermark)
+
+    assert {a["title"] for a in articles} == {f"Article {i}" for i in range(4)}
+    first = newsapi.requests[0]
+    assert first.url.params["to"] == minute(3)
+    assert "If-None-Match" not in first.headers
+    # Validators describe the unbounded query and are left alone.
+    assert next_watermark["etag"] == '"old"'
+    assert next_watermark["published_at"] == minute(9)
+    assert next_watermark["gap_before"] is None
+
+
+def test_untruncated_run_advances_to_the_newest_article(newsapi, monkeypatch):
+    monkeypatch.setitem(NEWSAPI, "max_pages", 10)
+    watermark = {"query": NEWSAPI["query"], "published_at": minute(0)}
+    articles, watermark = fetch(newsapi, watermark)
+
+    assert len(articles) == 10
+    assert watermark["published_at"] == minute(9)
+    assert watermark["etag"] == '"feed"'
+    assert newsapi.requests[0].headers.get("If-None-Match") is None
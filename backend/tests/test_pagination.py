@@ -0,0 +1,80 @@
+import asyncio
+import base64
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlalchemy")
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+
+from backend.api_service.pagination import decode_cursor, encode_cursor, estimate_count
+from backend.common.db.models import Article
+
+
+class FakeResult:
+    def scalar(self):
+        return [{"Plan": {"Plan Rows": 42}}]
+
+
+class FakeConnection:
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.calls = []
+
+    async def exec_driver_sql(self, sql, params):
+        self.calls.append((sql, params))
+        return FakeResult()
+
+
+class FakeSession:
+    def __init__(self, dialect):
+        self.conn = FakeConnection(dialect)
+
+    async def connection(self):
+        return self.conn
+
+
+@pytest.mark.parametrize("dialect", [PGDialect_asyncpg(), PGDialect_psycopg2()])
+def test_estimate_count_binds_search_text(dialect):
+    q = "price :foo's"
+    query = select(Article.id).where(
+        Article.search_vector.op("@@")(func.websearch_to_tsquery("english", q))
+    )
+    db = FakeSession(dialect)
+
+    assert asyncio.run(estimate_count(db, query, filtered=True)) == 42
+
+    (sql, params), = db.conn.calls
+    assert sql.startswith("EXPLAIN (FORMAT JSON) ")
+    assert q not in sql
+    assert ":foo" not in sql
+    values = list(params.values()) if isinstance(params, dict) else list(params)
+    assert q in values
+
+
+def test_cursor_round_trip():
+    published_at = datetime(2026, 1, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor(published_at, 9876)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (published_at, 9876)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        base64.urlsafe_b64encode(b"{}").decode(),
+        base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+        base64.urlsafe_b64encode(b'["2026-01-01T00:00:00", "x"]').decode(),
+        base64.urlsafe_b64encode(b"[1]").decode(),
+    ],
+)
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from backend.ingestion_service.ratelimit import TokenBucket, retry_after
+
+
+def test_acquire_spends_tokens():
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    for _ in range(3):
+        asyncio.run(bucket.acquire())
+    assert bucket.tokens < 1
+
+
+def test_refill_is_capped_at_capacity():
+    bucket = TokenBucket(rate=10.0, capacity=5)
+    bucket.tokens = 0
+    bucket._refill(bucket.updated_at + 0.2)
+    assert bucket.tokens == pytest.approx(2.0)
+    bucket._refill(bucket.updated_at + 60)
+    assert bucket.tokens == 5
+
+
+def test_pause_for_empties_the_bucket_and_never_shortens_a_pause():
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    bucket.pause_for(30)
+    paused_until = bucket.paused_until
+    bucket.pause_for(1)
+    assert bucket.tokens == 0
+    assert bucket.paused_until == paused_until
+    assert paused_until - time.monotonic() > 29
+
+
+def test_observe_pauses_until_an_epoch_reset():
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    bucket.observe({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 20)})
+    assert 18 < bucket.paused_until - time.monotonic() <= 20
+
+
+def test_observe_caps_tokens_at_remaining():
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    bucket.observe({"X-RateLimit-Remaining": "2"})
+    assert bucket.tokens == 2
+    assert bucket.paused_until == 0
+
+
+def test_observe_ignores_missing_or_malformed_headers():
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    bucket.observe({})
+    bucket.observe({"X-RateLimit-Remaining": "soon"})
+    assert bucket.tokens == 5
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("120", 120.0), ("0", 0.0), ("-5", 0.0), ("1.5", 1.5), ("", None), ("later", None)],
+)
+def test_retry_after_seconds(value, expected):
+    assert retry_after({"Retry-After": value}) == expected
+
+
+def test_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=90)
+    delay = retry_after({"Retry-After": format_datetime(when, usegmt=True)})
+    assert 85 <= delay <= 90
+
+
+def test_retry_after_date_in_the_past():
+    assert retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+
+
+def test_retry_after_missing():
+    assert retry_after({}) is None
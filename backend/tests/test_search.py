@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from backend.api_service.search import START_SEL, STOP_SEL, highlight_html
+
+
+def test_highlight_escapes_stored_markup():
+    headline = f'<img src=x onerror="alert(1)"> {START_SEL}inflation{STOP_SEL} & rates'
+    assert highlight_html(headline) == (
+        "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>inflation</mark> &amp; rates"
+    )
+
+
+def test_highlight_passes_none_through():
+    assert highlight_html(None) is None
@@ -0,0 +1,83 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from backend.common import serializers
+from backend.common.serializers import MAGIC, VERSION, DeserializationError, Serializer
+
+ITEM = {"title": "Rates rise", "body": "Officials said " * 200, "published_at": datetime(2026, 1, 1, 12, 0)}
+DECODED = dict(ITEM, published_at="2026-01-01T12:00:00")
+
+CONFIGS = [("json", "none"), ("json", "zstd"), ("json", "lz4"), ("msgpack", "none"), ("msgpack", "zstd"), ("msgpack", "lz4")]
+
+
+def available(fmt, compression):
+    modules = {"msgpack": serializers.msgpack, "zstd": serializers.zstandard, "lz4": serializers.lz4_frame}
+    return modules.get(fmt, True) is not None and modules.get(compression, True) is not None
+
+
+@pytest.mark.parametrize("fmt, compression", CONFIGS)
+def test_round_trip(fmt, compression):
+    if not available(fmt, compression):
+        pytest.skip(f"{fmt}/{compression} not installed")
+    serializer = Serializer(fmt, compression, compress_threshold=64)
+    assert serializer.loads(serializer.dumps(ITEM)) == DECODED
+
+
+@pytest.mark.parametrize("fmt, compression", CONFIGS)
+def test_any_serializer_reads_any_format(fmt, compression):
+    if not available(fmt, compression):
+        pytest.skip(f"{fmt}/{compression} not installed")
+    payload = Serializer(fmt, compression, compress_threshold=64).dumps(ITEM)
+    assert Serializer().loads(payload) == DECODED
+
+
+def test_header_framing():
+    if not available("msgpack", "zstd"):
+        pytest.skip("msgpack/zstd not installed")
+    payload = Serializer("msgpack", "zstd", compress_threshold=64).dumps(ITEM)
+    assert payload[:4] == bytes((MAGIC, VERSION, 1, 1))
+
+
+def test_small_payloads_are_not_compressed():
+    if not available("msgpack", "zstd"):
+        pytest.skip("msgpack/zstd not installed")
+    payload = Serializer("msgpack", "zstd", compress_threshold=1 << 20).dumps({"a": 1})
+    assert payload[3] == 0
+
+
+def test_plain_json_writes_the_legacy_format():
+    payload = Serializer().dumps({"a": 1})
+    assert payload[0] != MAGIC
+    assert json.loads(payload) == {"a": 1}
+
+
+def test_legacy_payloads_decode():
+    assert Serializer().loads('{"a": [1, 2]}') == {"a": [1, 2]}
+    assert Serializer().loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"",
+        b"{not json",
+        bytes((MAGIC, VERSION)),
+        bytes((MAGIC, VERSION + 1, 0, 0)) + b"{}",
+        bytes((MAGIC, VERSION, 0, 9)) + b"{}",
+        bytes((MAGIC, VERSION, 7, 0)) + b"{}",
+        bytes((MAGIC, VERSION, 0, 1)) + b"not zstd",
+        bytes((MAGIC, VERSION, 0, 2)) + b"not lz4",
+    ],
+)
+def test_undecodable_payloads_raise_deserialization_error(payload):
+    with pytest.raises(DeserializationError):
+        Serializer().loads(payload)
+
+
+def test_unknown_configuration_is_rejected():
+    with pytest.raises(ValueError):
+        Serializer("xml")
+    with pytest.raises(ValueError):
+        Serializer("json", "gzip")
@@ -0,0 +1,110 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("redis")
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+# The synthesis service runs from backend/ and imports `common` top-level.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from synthesis_service import writer as writer_module  # noqa: E402
+from synthesis_service.writer import BatchWriter, store_batch  # noqa: E402
+
+
+class FakeWriter(BatchWriter):
+    """Inserts in memory and fails any statement containing a bad row."""
+
+    def __init__(self, bad_urls=(), error=IntegrityError):
+        super().__init__(engine=None, sources=object())
+        self.bad_urls = set(bad_urls)
+        self.error = error
+        self.stored = []
+        self.statements = 0
+
+    def _insert(self, unique_rows):
+        self.statements += 1
+        if any(row["url"] in self.bad_urls for row in unique_rows):
+            raise self.error("INSERT INTO article ...", {}, Exception("value too long"))
+        self.stored.extend(row["url"] for row in unique_rows)
+        return len(unique_rows)
+
+
+class FakeQueue:
+    def __init__(self):
+        self.acked, self.dead, self.requeued = [], [], []
+
+    def ack(self, ids):
+        self.acked.extend(ids)
+
+    def dead_letter(self, entries):
+        self.dead.extend(entries)
+
+    def requeue(self, entries):
+        self.requeued.extend(entries)
+
+
+@pytest.fixture(autouse=True)
+def no_redis(monkeypatch):
+    monkeypatch.setattr(writer_module, "publish_data_change", lambda client: None)
+    monkeypatch.setattr(writer_module, "record_backlog", lambda client, count, threshold: None)
+
+
+def row(i):
+    return {"url": f"https://news.example/{i:02d}", "title": "t", "body": None, "published_at": None, "source_name": "s"}
+
+
+def test_clean_batch_is_one_statement():
+    writer = FakeWriter()
+    assert writer.write([row(i) for i in range(16)]) == (16, [])
+    assert writer.statements == 1
+
+
+def test_bad_rows_are_isolated():
+    rows = [row(i) for i in range(16)]
+    writer = FakeWriter(bad_urls={rows[3]["url"], rows[12]["url"]})
+
+    inserted, rejected = writer.write(rows)
+
+    assert inserted == 14
+    assert rejected == [rows[3], rows[12]]
+    assert sorted(writer.stored) == sorted(r["url"] for r in rows if r not in rejected)
+    # Two bad rows in 16 cost far fewer statements than one per row.
+    assert writer.statements < 16
+
+
+def test_duplicate_urls_are_written_once():
+    writer = FakeWriter()
+    assert writer.write([row(1), row(1), row(2)]) == (2, [])
+
+
+def test_connection_errors_are_not_bisected():
+    writer = FakeWriter(bad_urls={row(0)["url"]}, error=OperationalError)
+    with pytest.raises(OperationalError):
+        writer.write([row(i) for i in range(8)])
+    assert writer.statements == 1
+
+
+def test_store_batch_dead_letters_only_rejected_messages():
+    batch = [(f"id-{i}", {"url": row(i)["url"]}) for i in range(4)]
+    rows = [row(0), None, row(2), row(3)]
+    queue = FakeQueue()
+
+    store_batch(queue, FakeWriter(bad_urls={row(2)["url"]}), batch, rows)
+
+    assert queue.dead == [batch[2]]
+    assert queue.acked == ["id-0", "id-1", "id-2", "id-3"]
+    assert queue.requeued == []
+
+
+def test_store_batch_requeues_when_the_write_fails():
+    batch = [(f"id-{i}", {"url": row(i)["url"]}) for i in range(2)]
+    queue = FakeQueue()
+
+    store_batch(queue, FakeWriter(bad_urls={row(0)["url"]}, error=OperationalError), batch, [row(0), row(1)])
+
+    assert queue.requeued == batch
+    assert queue.acked == []
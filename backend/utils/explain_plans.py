@@ -0,0 +1,106 @@
+"""
+Check that the hot query paths use indexes.
+
+Runs EXPLAIN (FORMAT JSON) for each query the API and the clustering job
+issue on every request or run, and reports any sequential scan. On small
+development databases the planner may prefer sequential scans anyway; pass
+--no-seqscan to check that a usable index exists.
+
+Usage:
+    python -m backend.utils.explain_plans [--analyze] [--no-seqscan] [--strict]
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Set
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+HOT_QUERIES: Dict[str, str] = {
+    "latest articles": """
+        SELECT id, title, url, source_id, published_at FROM article
+        ORDER BY published_at DESC LIMIT 20
+    """,
+    "latest articles for a source": """
+        SELECT id, title, url, source_id, published_at FROM article
+        WHERE source_id = (SELECT min(id) FROM source)
+        ORDER BY published_at DESC LIMIT 20
+    """,
+    "article count for a source": """
+        SELECT count(*) FROM article WHERE source_id = (SELECT min(id) FROM source)
+    """,
+    "facts of an article": """
+        SELECT * FROM fact WHERE article_id = (SELECT min(id) FROM article)
+    """,
+    "unaligned facts": """
+        SELECT f.id FROM fact f
+        WHERE NOT EXISTS (SELECT 1 FROM alignment a WHERE a.fact_id = f.id)
+    """,
+    "facts of a cluster": """
+        SELECT fact_id FROM alignment WHERE cluster_id = (SELECT min(cluster_id) FROM alignment)
+    """,
+}
+
+# Relations a query has to read in full by design. Finding unaligned facts
+# is an anti-join over every fact, so only the alignment side, a probe of
+# alignment_fact_id_key, is checked.
+EXPECTED_SEQ_SCANS: Dict[str, Set[str]] = {
+    "unaligned facts": {"fact"},
+}
+
+
+def get_db_url():
+    load_dotenv()
+    return f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASS')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME')}"
+
+
+def seq_scans(plan: Dict) -> List[str]:
+    """
+    Relations read with a sequential scan anywhere in a JSON plan tree.
+    """
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyze", action="store_true", help="run EXPLAIN ANALYZE (executes the queries)")
+    parser.add_argument("--no-seqscan", action="store_true", help="discourage sequential scans in the planner")
+    parser.add_argument("--strict", action="store_true", help="exit non-zero if any sequential scan is found")
+    args = parser.parse_args()
+
+    options = "ANALYZE, FORMAT JSON" if args.analyze else "FORMAT JSON"
+    engine = create_engine(get_db_url())
+    failures = 0
+
+    with engine.connect() as conn:
+        if args.no_seqscan:
+            conn.execute(text("SET enable_seqscan = off"))
+
+        for name, query in HOT_QUERIES.items():
+            result = conn.execute(text(f"EXPLAIN ({options}) {query}")).scalar()
+            plan = (json.loads(result) if isinstance(result, str) else result)[0]
+            expected = EXPECTED_SEQ_SCANS.get(name, set())
+            scans = [scan for scan in seq_scans(plan["Plan"]) if scan not in expected]
+            cost = plan["Plan"]["Total Cost"]
+            timing = f", {plan['Execution Time']:.2f} ms" if "Execution Time" in plan else ""
+
+            if scans:
+                failures += 1
+                print(f"SEQ SCAN  {name}: {', '.join(scans)} (cost {cost:.0f}{timing})")
+            else:
+                note = f", seq scan of {', '.join(sorted(expected))} expected" if expected else ""
+                print(f"ok        {name} (cost {cost:.0f}{timing}{note})")
+
+    if args.strict and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,8 @@ export interface PaginatedArticles {
   total: number; // Assuming a total count is also returned for pagination
   skip: number;
   limit: number;
+  total_is_estimate?: boolean;
+  next_cursor?: string | null; // Opaque keyset cursor for the next page
 }
 
 export interface Source {